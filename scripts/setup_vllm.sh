@@ -15,9 +15,33 @@ if ! command -v vllm &> /dev/null; then
     exit 1
 fi
 
+# Keep idle HTTP connections open as long as the pipeline client does
+# (validation.keepalive_expiry); vllm closes them after 5s by default
+export VLLM_HTTP_TIMEOUT_KEEP_ALIVE=${VLLM_HTTP_TIMEOUT_KEEP_ALIVE:-30}
+
+# Batching: vllm batches concurrent requests into each decode step, up to
+# --max-num-seqs sequences. The pipeline keeps validation.max_workers requests
+# in flight, so set both to the same value to fill the batches.
+MAX_NUM_SEQS=${MAX_NUM_SEQS:-64}
+MAX_NUM_BATCHED_TOKENS=${MAX_NUM_BATCHED_TOKENS:-16384}
+# Both servers share one GPU by default
+GPU_MEMORY_UTILIZATION=${GPU_MEMORY_UTILIZATION:-0.4}
+
+# Load is asymmetric: every row goes to the primary, only disagreements to the
+# secondary. The secondary gets half the sequences by default; give the memory
+# it leaves unused to the primary with the per-server overrides, and match
+# validation.primary_max_concurrency / secondary_max_concurrency.
+PRIMARY_MAX_NUM_SEQS=${PRIMARY_MAX_NUM_SEQS:-$MAX_NUM_SEQS}
+SECONDARY_MAX_NUM_SEQS=${SECONDARY_MAX_NUM_SEQS:-$((MAX_NUM_SEQS / 2))}
+PRIMARY_GPU_MEMORY_UTILIZATION=${PRIMARY_GPU_MEMORY_UTILIZATION:-$GPU_MEMORY_UTILIZATION}
+SECONDARY_GPU_MEMORY_UTILIZATION=${SECONDARY_GPU_MEMORY_UTILIZATION:-$GPU_MEMORY_UTILIZATION}
+
 # Start primary model (Whisper Large V3) on port 8000
 echo -e "${GREEN}Starting Whisper Large V3 on port 8000...${NC}"
-vllm serve openai/whisper-large-v3 --port 8000 &
+vllm serve openai/whisper-large-v3 --port 8000 \
+    --gpu-memory-utilization "$PRIMARY_GPU_MEMORY_UTILIZATION" \
+    --max-num-seqs "$PRIMARY_MAX_NUM_SEQS" \
+    --max-num-batched-tokens "$MAX_NUM_BATCHED_TOKENS" &
 PRIMARY_PID=$!
 
 # Wait a bit
@@ -25,7 +49,10 @@ sleep 5
 
 # Start secondary model (Whisper Turbo) on port 8001
 echo -e "${GREEN}Starting Whisper Turbo on port 8001...${NC}"
-vllm serve openai/whisper-large-v3-turbo --port 8001 &
+vllm serve openai/whisper-large-v3-turbo --port 8001 \
+    --gpu-memory-utilization "$SECONDARY_GPU_MEMORY_UTILIZATION" \
+    --max-num-seqs "$SECONDARY_MAX_NUM_SEQS" \
+    --max-num-batched-tokens "$MAX_NUM_BATCHED_TOKENS" &
 SECONDARY_PID=$!
 
 echo -e "${GREEN}Both servers started!${NC}"
@@ -8,10 +8,23 @@ from audio files and their corresponding SRT transcriptions.
 __version__ = "1.0.0"
 __author__ = "STT Project Team"
 
-from .pipeline import DatasetPipeline
-from .chunker import AudioChunker
-from .merger import AudioMerger
-from .validator import TranscriptionValidator
+import importlib
+from typing import TYPE_CHECKING
+
+# Public classes are imported on first access (PEP 562) so that importing the
+# package, e.g. for the CLI's --help, doesn't load numpy, hazm and openai
+_LAZY_IMPORTS = {
+    "DatasetPipeline": ".pipeline",
+    "AudioChunker": ".chunker",
+    "AudioMerger": ".merger",
+    "TranscriptionValidator": ".validator",
+}
+
+if TYPE_CHECKING:
+    from .pipeline import DatasetPipeline
+    from .chunker import AudioChunker
+    from .merger import AudioMerger
+    from .validator import TranscriptionValidator
 
 __all__ = [
     "DatasetPipeline",
@@ -19,3 +32,17 @@ __all__ = [
     "AudioMerger",
     "TranscriptionValidator",
 ]
+
+
+def __getattr__(name):
+    """Import public classes on first access."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Include the lazily imported classes in dir()."""
+    return sorted(set(globals()) | set(__all__))
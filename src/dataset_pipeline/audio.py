@@ -0,0 +1,211 @@
+"""
+Raw WAV I/O shared by the chunking and merging steps.
+
+PCM WAV files are read and written directly with the standard library; pydub
+is only imported to decode other formats.
+"""
+
+import os
+import mmap
+import wave
+import struct
+from typing import BinaryIO, Sequence, Tuple, Union
+
+# (nchannels, sampwidth, framerate)
+PcmParams = Tuple[int, int, int]
+
+# Canonical 44-byte PCM WAV header. Only the RIFF size (offset 4) and the
+# data size (offset 40) differ between files of the same format.
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+_U32 = struct.Struct("<I")
+
+_COPY_BUFSIZE = 1024 * 1024
+
+
+def _pcm_layout(f: BinaryIO) -> Tuple[PcmParams, int, int]:
+    """
+    Locate the PCM payload of an open WAV file.
+
+    Args:
+        f: WAV file opened in binary mode
+
+    Returns:
+        Tuple of (params, data_offset, data_size)
+    """
+    file_size = os.fstat(f.fileno()).st_size
+
+    # Files written by this package (and most PCM WAVs) start with the
+    # canonical header; unpack it directly instead of parsing with wave
+    head = f.read(_WAV_HEADER.size)
+    if len(head) == _WAV_HEADER.size:
+        (riff, _, wave_id, fmt_id, fmt_size, fmt_tag, nchannels, framerate, _,
+         block_align, bits, data_id, data_size) = _WAV_HEADER.unpack(head)
+        if (riff == b"RIFF" and wave_id == b"WAVE" and fmt_id == b"fmt " and fmt_size == 16
+                and fmt_tag == 1 and data_id == b"data" and nchannels and bits and bits % 8 == 0
+                and block_align == nchannels * bits // 8):
+            data_size = min(data_size, file_size - _WAV_HEADER.size)
+            data_size -= data_size % block_align
+            return (nchannels, bits // 8, framerate), _WAV_HEADER.size, data_size
+    f.seek(0)
+
+    with wave.open(f, 'rb') as wf:
+        params = (wf.getnchannels(), wf.getsampwidth(), wf.getframerate())
+        # wave leaves the file positioned at the start of the data chunk
+        data_offset = f.tell()
+        data_size = wf.getnframes() * params[0] * params[1]
+    # Don't trust the header of a truncated file
+    data_size = min(data_size, file_size - data_offset)
+    return params, data_offset, data_size
+
+
+def load_wav_mmap(path: str) -> Tuple[PcmParams, mmap.mmap, int, int]:
+    """
+    Memory-map the PCM payload of a WAV file.
+
+    Args:
+        path: Path to WAV file
+
+    Returns:
+        Tuple of (params, mmap, data_offset, data_size)
+    """
+    with open(path, 'rb') as f:
+        params, data_offset, data_size = _pcm_layout(f)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return params, mm, data_offset, data_size
+
+
+def wav_data_range(path: str) -> Tuple[PcmParams, int, int]:
+    """
+    Get the format and byte range of the PCM payload of a WAV file.
+
+    Args:
+        path: Path to WAV file
+
+    Returns:
+        Tuple of (params, data_offset, data_size)
+    """
+    with open(path, 'rb') as f:
+        return _pcm_layout(f)
+
+
+def decode_audio(path: str) -> Tuple[PcmParams, memoryview, int, int]:
+    """
+    Decode a non-PCM-WAV audio file (e.g. mp3) to raw PCM via pydub.
+
+    Args:
+        path: Path to audio file
+
+    Returns:
+        Tuple of (params, pcm_buffer, data_offset, data_size)
+    """
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(path)
+    raw = audio.raw_data
+    return (audio.channels, audio.sample_width, audio.frame_rate), memoryview(raw), 0, len(raw)
+
+
+def wav_header_template(params: PcmParams) -> bytes:
+    """
+    Build a WAV header for the given format with zeroed size fields.
+
+    Args:
+        params: (nchannels, sampwidth, framerate)
+
+    Returns:
+        44-byte header template
+    """
+    nchannels, sampwidth, framerate = params
+    block_align = nchannels * sampwidth
+    return _WAV_HEADER.pack(
+        b"RIFF", 0, b"WAVE",
+        b"fmt ", 16, 1, nchannels, framerate, framerate * block_align, block_align,
+        sampwidth * 8,
+        b"data", 0
+    )
+
+
+def write_wav(path: str, header_template: bytes, frames: Union[bytes, memoryview]) -> None:
+    """
+    Write raw PCM frames to a WAV file.
+
+    Args:
+        path: Output path
+        header_template: Header from wav_header_template
+        frames: Raw PCM frames (a byte-format memoryview is written without copying)
+    """
+    header = bytearray(header_template)
+    _U32.pack_into(header, 4, 36 + len(frames))
+    _U32.pack_into(header, 40, len(frames))
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(frames)
+
+
+def _copy_range(src: BinaryIO, dst: BinaryIO, offset: int, count: int) -> None:
+    """
+    Append count bytes of src, starting at offset, to dst.
+
+    Uses copy_file_range (Linux; may reflink or offload the copy to the
+    filesystem) or sendfile where available, so the data never passes
+    through Python.
+    """
+    dst.flush()
+
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while count > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), count, offset)
+                if copied == 0:
+                    return
+                offset += copied
+                count -= copied
+            return
+        except OSError:
+            # e.g. EXDEV across filesystems on older kernels
+            pass
+
+    if hasattr(os, 'sendfile'):
+        try:
+            while count > 0:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, count)
+                if sent == 0:
+                    return
+                offset += sent
+                count -= sent
+            return
+        except OSError:
+            # e.g. macOS, where the destination must be a socket
+            pass
+
+    src.seek(offset)
+    while count > 0:
+        buf = src.read(min(count, _COPY_BUFSIZE))
+        if not buf:
+            return
+        dst.write(buf)
+        count -= len(buf)
+
+
+def concat_wavs(
+    output_path: str,
+    params: PcmParams,
+    sources: Sequence[Tuple[str, int, int]]
+) -> None:
+    """
+    Write the PCM payloads of same-format WAV files back to back into one WAV.
+
+    Args:
+        output_path: Output WAV path
+        params: Common (nchannels, sampwidth, framerate) of the sources
+        sources: (path, data_offset, data_size) per source, from wav_data_range
+    """
+    data_size = sum(size for _, _, size in sources)
+    header = bytearray(wav_header_template(params))
+    _U32.pack_into(header, 4, 36 + data_size)
+    _U32.pack_into(header, 40, data_size)
+    with open(output_path, 'wb') as out:
+        out.write(header)
+        for path, data_offset, size in sources:
+            with open(path, 'rb') as src:
+                _copy_range(src, out, data_offset, size)
@@ -5,21 +5,67 @@ Handles splitting audio files based on SRT timestamps with validation.
 """
 
 import os
-import csv
+import mmap
+import wave
 import logging
+import logging.handlers
+import threading
+import concurrent.futures
+import multiprocessing
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Tuple, Union
 
+import numpy as np
 import pysrt
-from pydub import AudioSegment
+from tqdm import tqdm
 
+from .audio import decode_audio, load_wav_mmap, wav_header_template, write_wav
 from .config import ChunkingConfig
-from .utils import ensure_dir
+from .utils import SEPARATOR, BatchCsvWriter, ensure_dir
 
 
 logger = logging.getLogger(__name__)
 
 
+class _ForwardToLoggers(logging.Handler):
+    """Re-emit log records from worker processes through this process's loggers."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        logging.getLogger(record.name).handle(record)
+
+
+def _init_worker_logging(log_queue: "multiprocessing.Queue", level: int) -> None:
+    """
+    Send a worker process's log records to the parent.
+
+    Spawned workers start with no logging configuration, so without this their
+    records would miss the console/file handlers set up by setup_logging.
+
+    Args:
+        log_queue: Queue drained by a listener in the parent process
+        level: Root logger level of the parent
+    """
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+def _process_file_worker(
+    task: Tuple[ChunkingConfig, str, str, str]
+) -> Tuple[List[Tuple[str, str]], int, int, int]:
+    """
+    Chunk one audio + SRT pair in a worker process.
+
+    Args:
+        task: Tuple of (config, audio_path, srt_path, output_dir)
+
+    Returns:
+        Same as AudioChunker.process_file
+    """
+    config, audio_path, srt_path, output_dir = task
+    return AudioChunker(config).process_file(audio_path, srt_path, output_dir)
+
+
 class AudioChunker:
     """Handles audio chunking based on SRT timestamps."""
 
@@ -32,13 +78,18 @@ class AudioChunker:
         """
         self.config = config
         self.min_duration_ms = config.min_duration_ms
+        self.write_workers = max(1, config.write_workers)
+        self.max_workers = max(1, config.max_workers)
+        # Files that failed to chunk plus chunks that failed to write in the
+        # last run(); the pipeline doesn't cache a run with errors
+        self.errors = 0
 
     def process_file(
         self,
         audio_path: str,
         srt_path: str,
         output_dir: str
-    ) -> Tuple[List[Tuple[str, str]], int, int]:
+    ) -> Tuple[List[Tuple[str, str]], int, int, int]:
         """
         Process a single audio + SRT file pair.
 
@@ -48,68 +99,163 @@ class AudioChunker:
             output_dir: Output directory for chunks
 
         Returns:
-            Tuple of (valid_chunks, total_processed, skipped_count)
+            Tuple of (valid_chunks, total_processed, skipped_count, error_count);
+            error_count is the number of chunks that failed to write, or 1 if
+            the file could not be chunked at all
         """
         try:
             logger.info(f"Chunking: {Path(audio_path).name}")
 
-            # Load SRT and audio (format inferred from extension: .wav, .mp3, ...)
             subs = pysrt.open(srt_path, encoding='utf-8')
-            audio = AudioSegment.from_file(audio_path)
-
-            valid_chunks = []
-            skipped = 0
-
-            for i in range(len(subs)):
-                current_sub = subs[i]
-
-                # Get start time
-                start_ms = current_sub.start.ordinal
-
-                # Determine end time
-                end_ms = current_sub.end.ordinal
-
-                # Truncate if next subtitle starts before this one ends
-                if i < len(subs) - 1:
-                    next_start_ms = subs[i + 1].start.ordinal
-                    if next_start_ms < end_ms:
-                        end_ms = next_start_ms
-
-                # Calculate duration
-                duration = end_ms - start_ms
-
-                # Validation: skip if too short
-                if duration < self.min_duration_ms:
-                    logger.debug(f"  Skipping segment {i}: duration {duration}ms < {self.min_duration_ms}ms")
-                    skipped += 1
-                    continue
-
-                # Extract audio chunk
-                chunk = audio[start_ms:end_ms]
-
-                # Clean text
-                text = current_sub.text.replace('\n', ' ').strip()
-
-                if not text:
+            count = len(subs)
+
+            # Subtitle timings as flat arrays: truncation, filtering and byte
+            # offsets are computed for the whole file at once
+            starts = np.fromiter((sub.start.ordinal for sub in subs), dtype=np.int64, count=count)
+            ends = np.fromiter((sub.end.ordinal for sub in subs), dtype=np.int64, count=count)
+            texts = [sub.text.replace('\n', ' ').strip() for sub in subs]
+
+            # Truncate if next subtitle starts before this one ends (in place,
+            # without a temporary array)
+            np.minimum(ends[:-1], starts[1:], out=ends[:-1])
+
+            # Validation: skip if too short or without text
+            durations = ends - starts
+            long_enough = durations >= self.min_duration_ms
+            has_text = np.fromiter(map(bool, texts), dtype=bool, count=count)
+            keep = long_enough & has_text
+            skipped = count - int(keep.sum())
+
+            if logger.isEnabledFor(logging.DEBUG):
+                for i in np.flatnonzero(~long_enough).tolist():
+                    logger.debug(
+                        f"  Skipping segment {i}: "
+                        f"duration {durations[i]}ms < {self.min_duration_ms}ms"
+                    )
+                for i in np.flatnonzero(long_enough & ~has_text).tolist():
                     logger.debug(f"  Skipping segment {i}: empty text")
-                    skipped += 1
-                    continue
 
-                # Generate filename
-                base_name = Path(audio_path).stem
-                chunk_filename = f"{base_name}_segment_{i:04d}.wav"
-                chunk_path = os.path.join(output_dir, chunk_filename)
-
-                # Export audio
-                chunk.export(chunk_path, format="wav")
-                valid_chunks.append((chunk_filename, text))
+            # Load audio. PCM WAVs are memory-mapped and sliced as raw bytes;
+            # anything else (.mp3, compressed WAV) is decoded once via pydub.
+            pcm: Union[mmap.mmap, memoryview]
+            if Path(audio_path).suffix.lower() == ".wav":
+                try:
+                    params, pcm, data_offset, data_size = load_wav_mmap(audio_path)
+                except wave.Error:
+                    params, pcm, data_offset, data_size = decode_audio(audio_path)
+            else:
+                params, pcm, data_offset, data_size = decode_audio(audio_path)
+
+            # Byte range of every chunk inside the PCM buffer
+            nchannels, sampwidth, framerate = params
+            bytes_per_frame = nchannels * sampwidth
+            data_end = data_offset + data_size
+            header = wav_header_template(params)
+            start_bytes = np.minimum(
+                data_offset + (starts * framerate // 1000) * bytes_per_frame, data_end
+            ).tolist()
+            end_bytes = np.minimum(
+                data_offset + (ends * framerate // 1000) * bytes_per_frame, data_end
+            ).tolist()
+
+            base_name = Path(audio_path).stem
+
+            # Chunk writes are I/O-bound: hand them to a small thread pool while
+            # the loop slices the next chunk. The semaphore caps how many sliced
+            # buffers can be queued at once.
+            pending = []
+            slots = threading.BoundedSemaphore(2 * self.write_workers)
+
+            try:
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.write_workers
+                ) as executor:
+                    for i in np.flatnonzero(keep).tolist():
+                        # Generate filename
+                        chunk_filename = f"{base_name}_segment_{i:04d}.wav"
+                        chunk_path = os.path.join(output_dir, chunk_filename)
+
+                        # Export audio
+                        slots.acquire()
+                        future = executor.submit(
+                            write_wav, chunk_path, header, pcm[start_bytes[i]:end_bytes[i]]
+                        )
+                        future.add_done_callback(lambda _: slots.release())
+                        pending.append((future, chunk_filename, texts[i]))
+            finally:
+                if isinstance(pcm, mmap.mmap):
+                    pcm.close()
+
+            valid_chunks = [
+                (chunk_filename, text)
+                for future, chunk_filename, text in pending
+                if future.exception() is None
+            ]
+            errors = len(pending) - len(valid_chunks)
+            if errors:
+                for future, chunk_filename, _ in pending:
+                    error = future.exception()
+                    if error is not None:
+                        logger.error(f"  ✗ Failed to write {chunk_filename}: {error}")
+                skipped += errors
 
             logger.info(f"  ✓ Created {len(valid_chunks)} chunks ({skipped} skipped)")
-            return valid_chunks, len(subs), skipped
+            return valid_chunks, count, skipped, errors
 
         except Exception as e:
             logger.error(f"  ✗ Error chunking {Path(audio_path).name}: {e}", exc_info=True)
-            return [], 0, 0
+            return [], 0, 0, 1
+
+    def _iter_results(
+        self,
+        audio_srt_pairs: List[Tuple[str, str]],
+        output_dir: str
+    ) -> Iterator[Tuple[List[Tuple[str, str]], int, int, int]]:
+        """
+        Chunk every pair, yielding process_file results in input order.
+
+        Args:
+            audio_srt_pairs: List of (audio_path, srt_path) tuples
+            output_dir: Output directory for chunks
+
+        Yields:
+            Tuple of (valid_chunks, total_processed, skipped_count, error_count)
+            per pair
+        """
+        workers = min(self.max_workers, len(audio_srt_pairs))
+        if workers <= 1:
+            for audio_path, srt_path in audio_srt_pairs:
+                yield self.process_file(audio_path, srt_path, output_dir)
+            return
+
+        # Pairs are independent; chunk them in separate processes. "spawn"
+        # avoids forking a parent that may already hold threads/locks.
+        tasks = [
+            (self.config, audio_path, srt_path, output_dir)
+            for audio_path, srt_path in audio_srt_pairs
+        ]
+        logger.info(f"Chunking {len(tasks)} files with {workers} processes...")
+        context = multiprocessing.get_context("spawn")
+        # Worker log records come back over a queue and are handled by this
+        # process's loggers, so they reach the configured console/file handlers
+        log_queue = context.Queue()
+        log_listener = logging.handlers.QueueListener(log_queue, _ForwardToLoggers())
+        log_listener.start()
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_worker_logging,
+                initargs=(log_queue, logging.getLogger().getEffectiveLevel())
+            ) as executor:
+                yield from tqdm(
+                    executor.map(_process_file_worker, tasks, chunksize=1),
+                    total=len(tasks),
+                    desc="Chunking"
+                )
+        finally:
+            log_listener.stop()
+            log_queue.close()
 
     def run(
         self,
@@ -126,37 +272,37 @@ class AudioChunker:
         Returns:
             Tuple of (output_dir, metadata_path)
         """
-        logger.info("=" * 60)
+        logger.info(SEPARATOR)
         logger.info("STEP 1: CHUNKING AUDIO FILES")
-        logger.info("=" * 60)
+        logger.info(SEPARATOR)
 
         output_dir = os.path.join(output_base_dir, self.config.output_subdir)
         ensure_dir(output_dir)
 
-        all_chunks = []
         total_processed = 0
         total_skipped = 0
+        self.errors = 0
 
-        for audio_path, srt_path in audio_srt_pairs:
-            chunks, processed, skipped = self.process_file(audio_path, srt_path, output_dir)
-            all_chunks.extend(chunks)
-            total_processed += processed
-            total_skipped += skipped
-
-        # Write metadata
+        # Rows are written as each file finishes rather than collected first
         metadata_path = os.path.join(output_dir, self.config.metadata_file)
-        with open(metadata_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f, delimiter='|')
-            writer.writerow(["file_name", "text"])
-            writer.writerows(all_chunks)
-
-        logger.info(f"\n{'=' * 60}")
+        with BatchCsvWriter(metadata_path, ["file_name", "text"]) as metadata:
+            for chunks, processed, skipped, errors in self._iter_results(
+                audio_srt_pairs, output_dir
+            ):
+                metadata.add_many(chunks)
+                total_processed += processed
+                total_skipped += skipped
+                self.errors += errors
+
+        logger.info(f"\n{SEPARATOR}")
         logger.info("Chunking Summary:")
         logger.info(f"  Total segments processed: {total_processed}")
-        logger.info(f"  Valid chunks created: {len(all_chunks)}")
+        logger.info(f"  Valid chunks created: {metadata.count}")
         logger.info(f"  Skipped: {total_skipped}")
+        if self.errors:
+            logger.info(f"  Errors: {self.errors}")
         logger.info(f"  Output directory: {output_dir}")
         logger.info(f"  Metadata file: {metadata_path}")
-        logger.info(f"{'=' * 60}\n")
+        logger.info(f"{SEPARATOR}\n")
 
         return output_dir, metadata_path
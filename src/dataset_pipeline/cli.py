@@ -2,20 +2,89 @@
 Command-line interface for the dataset pipeline.
 """
 
+import os
 import sys
 import argparse
 import logging
 from pathlib import Path
+from typing import List, Optional
 
+from . import __version__
 from .config import Config, setup_logging
-from .pipeline import DatasetPipeline
+from .utils import WIDE_SEPARATOR
 
 
 logger = logging.getLogger(__name__)
 
 
-def main():
-    """Main entry point for CLI."""
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+
+# Options understood by _fast_parse: flag -> (dest, takes_value)
+_FAST_OPTIONS = {
+    '--config': ('config', True),
+    '-c': ('config', True),
+    '--input': ('input', True),
+    '-i': ('input', True),
+    '--output': ('output', True),
+    '-o': ('output', True),
+    '--log-level': ('log_level', True),
+    '--skip-chunking': ('skip_chunking', False),
+    '--skip-merging': ('skip_merging', False),
+    '--skip-validation': ('skip_validation', False),
+    '--no-cache': ('no_cache', False),
+}
+
+
+def _fast_parse(argv: List[str]) -> Optional[argparse.Namespace]:
+    """
+    Parse the common invocations without building the argparse parser.
+
+    Args:
+        argv: Command-line arguments, without the program name
+
+    Returns:
+        Parsed arguments, or None if argv needs the full parser (help,
+        version, abbreviations, invalid values, ...)
+    """
+    args = argparse.Namespace(
+        config='config/config.yaml',
+        input=None,
+        output=None,
+        skip_chunking=False,
+        skip_merging=False,
+        skip_validation=False,
+        no_cache=False,
+        log_level=None,
+    )
+
+    tokens = iter(argv)
+    for token in tokens:
+        flag, sep, inline_value = token.partition('=')
+        value: Optional[str] = inline_value if sep else None
+        option = _FAST_OPTIONS.get(flag)
+        if option is None or (sep and not flag.startswith('--')):
+            return None
+
+        dest, takes_value = option
+        if not takes_value:
+            if sep:
+                return None
+            setattr(args, dest, True)
+            continue
+
+        if value is None:
+            value = next(tokens, None)
+            if value is None or value.startswith('-'):
+                return None
+        if dest == 'log_level' and value not in LOG_LEVELS:
+            return None
+        setattr(args, dest, value)
+
+    return args
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the full argument parser."""
     parser = argparse.ArgumentParser(
         description="Production-level dataset creation pipeline for audio + SRT transcription",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -78,20 +147,38 @@ For more information, see: README.md
         help='Skip the validation step'
     )
 
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Rerun every step even if its cached outputs are up to date'
+    )
+
     parser.add_argument(
         '--log-level',
         type=str,
-        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+        choices=LOG_LEVELS,
         help='Logging level (overrides config file)'
     )
 
     parser.add_argument(
         '--version',
         action='version',
-        version='%(prog)s 1.0.0'
+        version=f'%(prog)s {__version__}'
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main entry point for CLI."""
+    # Answer a bare --version without building the parser
+    if sys.argv[1:] == ['--version']:
+        print(f"{os.path.basename(sys.argv[0])} {__version__}")
+        sys.exit(0)
+
+    args = _fast_parse(sys.argv[1:])
+    if args is None:
+        args = _build_parser().parse_args()
 
     try:
         # Load configuration
@@ -115,6 +202,8 @@ For more information, see: README.md
             config.steps.merging = False
         if args.skip_validation:
             config.steps.validation = False
+        if args.no_cache:
+            config.use_cache = False
 
         if args.log_level:
             config.logging.level = args.log_level
@@ -122,15 +211,17 @@ For more information, see: README.md
         # Setup logging
         setup_logging(config.logging)
 
-        # Run pipeline
+        # Run pipeline (imported here so --help/--version stay fast)
+        from .pipeline import DatasetPipeline
+
         logger.info(f"Starting pipeline with config: {config_path}")
         pipeline = DatasetPipeline(config)
         results = pipeline.run()
 
         # Print summary
-        print("\n" + "=" * 80)
+        print("\n" + WIDE_SEPARATOR)
         print("PIPELINE SUMMARY")
-        print("=" * 80)
+        print(WIDE_SEPARATOR)
         print(f"Steps completed: {', '.join(results['steps_completed'])}")
         print(f"Output directory: {results['output_dir']}")
 
@@ -139,7 +230,7 @@ For more information, see: README.md
         if 'flagged_files' in results:
             print(f"Flagged files: {results['flagged_files']}")
 
-        print("=" * 80)
+        print(WIDE_SEPARATOR)
 
         sys.exit(0)
 
@@ -6,33 +6,47 @@ and environment variables.
 """
 
 import os
+import sys
+import json
+import queue
+import atexit
 import logging
+import logging.handlers
 from pathlib import Path
 from typing import Dict, Any, Optional
-import yaml
 from dataclasses import dataclass, field
 
 
 logger = logging.getLogger(__name__)
 
+# Slotted config dataclasses where supported (Python 3.10+): smaller instances,
+# faster attribute access, and typos in attribute assignments raise
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Background thread writing log records for the handlers set up by setup_logging
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ChunkingConfig:
     """Configuration for audio chunking."""
     min_duration_ms: int = 500
     output_subdir: str = "chunked"
     metadata_file: str = "metadata_chunked.csv"
+    write_workers: int = 4
+    max_workers: int = 4
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class MergingConfig:
     """Configuration for audio merging."""
     keep_first_segment: bool = True
     output_subdir: str = "merged"
     metadata_file: str = "metadata_merged.csv"
+    max_workers: int = 4
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ValidationConfig:
     """Configuration for transcription validation."""
     primary_port: int = 8000
@@ -42,11 +56,22 @@ class ValidationConfig:
     boundary_window: int = 2
     language: str = "fa"
     max_workers: int = 8
+    primary_max_concurrency: Optional[int] = None
+    secondary_max_concurrency: Optional[int] = None
+    speculative_secondary: bool = False
+    sort_by_size: bool = False
+    skip_secondary_on_full_mismatch: bool = False
+    min_audio_bytes: int = 1024
+    text_cache_size: int = 100_000
+    keepalive_expiry: float = 30.0
+    max_retries: int = 2
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
     output_metadata: str = "metadata_validated.csv"
     flagged_file: str = "flagged_files.csv"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class StepsConfig:
     """Configuration for pipeline steps."""
     chunking: bool = True
@@ -54,7 +79,7 @@ class StepsConfig:
     validation: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LoggingConfig:
     """Configuration for logging."""
     level: str = "INFO"
@@ -63,7 +88,7 @@ class LoggingConfig:
     console: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Config:
     """Main configuration class."""
     input_dir: str
@@ -73,6 +98,11 @@ class Config:
     merging: MergingConfig = field(default_factory=MergingConfig)
     validation: ValidationConfig = field(default_factory=ValidationConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
+    use_cache: bool = False
+
+    def stage_dir(self, name: str) -> str:
+        """Path of a pipeline-owned subdirectory of output_dir (e.g. the stage cache)."""
+        return os.path.join(self.output_dir, name)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Config":
@@ -85,6 +115,7 @@ class Config:
             merging=MergingConfig(**data.get("merging", {})),
             validation=ValidationConfig(**data.get("validation", {})),
             logging=LoggingConfig(**data.get("logging", {})),
+            use_cache=data.get("use_cache", False),
         )
 
     @classmethod
@@ -95,8 +126,7 @@ class Config:
             if not config_path.exists():
                 raise FileNotFoundError(f"Config file not found: {config_path}")
 
-            with open(config_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = cls._load_yaml_cached(config_path)
 
             # Override with environment variables if present
             data = cls._apply_env_overrides(data)
@@ -108,6 +138,47 @@ class Config:
             logger.error(f"Failed to load config: {e}")
             raise
 
+    @staticmethod
+    def _load_yaml_cached(config_path: Path) -> Dict[str, Any]:
+        """
+        Parse a YAML config, reusing a JSON copy of the result while the file is unchanged.
+
+        The cache sits next to the config as ``.<name>.cache.json`` and is keyed
+        on the file's mtime and size. Environment overrides are not cached.
+        """
+        stat = config_path.stat()
+        key = [stat.st_mtime_ns, stat.st_size]
+        cache_path = config_path.with_name(f".{config_path.name}.cache.json")
+
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached["key"] == key:
+                cached_data: Dict[str, Any] = cached["data"]
+                return cached_data
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        import yaml
+
+        # libyaml's C loader when PyYAML was built with it; same safe semantics
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(config_path, 'r', encoding='utf-8') as f:
+            data: Dict[str, Any] = yaml.load(f.read(), Loader=loader)
+
+        # Only cache what JSON round-trips exactly (no dates, non-string keys, ...)
+        try:
+            payload = json.dumps({"key": key, "data": data}, ensure_ascii=False)
+            if json.loads(payload)["data"] == data:
+                tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Not caching parsed config: {e}")
+
+        return data
+
     @staticmethod
     def _apply_env_overrides(config_data: Dict[str, Any]) -> Dict[str, Any]:
         """Apply environment variable overrides to config."""
@@ -142,6 +213,8 @@ class Config:
 
 def setup_logging(config: LoggingConfig, log_dir: str = "logs") -> None:
     """Setup logging based on configuration."""
+    global _log_listener
+
     level = getattr(logging, config.level.upper(), logging.INFO)
 
     # Create logs directory
@@ -162,12 +235,37 @@ def setup_logging(config: LoggingConfig, log_dir: str = "logs") -> None:
         file_handler.setFormatter(logging.Formatter(config.format))
         handlers.append(file_handler)
 
+    # Logging calls only enqueue the record; a listener thread does the
+    # console/file I/O. Records are flushed when the listener is stopped.
+    _stop_log_listener()
+    # unregister first so repeated setup_logging calls register it only once
+    atexit.unregister(_stop_log_listener)
+    atexit.register(_stop_log_listener)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # QueueHandler pre-renders the message; the real handlers apply config.format
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _log_listener.start()
+
     # Configure root logger
     logging.basicConfig(
         level=level,
-        format=config.format,
-        handlers=handlers,
+        handlers=[queue_handler],
         force=True  # Override any existing configuration
     )
 
     logger.info(f"Logging configured: level={config.level}, file={config.file}")
+
+
+def _stop_log_listener() -> None:
+    """Flush queued log records and stop the listener thread (safe to call again)."""
+    global _log_listener
+
+    if _log_listener is not None:
+        listener, _log_listener = _log_listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
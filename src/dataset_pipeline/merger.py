@@ -5,20 +5,55 @@ Handles merging of audio segments in pairs.
 """
 
 import os
-import csv
+import wave
+import shutil
 import logging
-from typing import List, Tuple
+import itertools
+import collections
+import concurrent.futures
+from typing import Any, Deque, List, Optional, Tuple
 
-from pydub import AudioSegment
 from tqdm import tqdm
 
+from .audio import PcmParams, concat_wavs, wav_data_range
 from .config import MergingConfig
-from .utils import ensure_dir
+from .utils import SEPARATOR, BatchCsvWriter, count_metadata_rows, ensure_dir, iter_metadata_rows
 
 
 logger = logging.getLogger(__name__)
 
 
+def _merge_wavs(path1: str, path2: str, output_path: str) -> None:
+    """
+    Concatenate two WAV files into one.
+
+    Same-format PCM files are joined by copying their data chunks under a new
+    header; anything else falls back to pydub, which converts the second file
+    to match the first.
+
+    Args:
+        path1: First WAV file
+        path2: Second WAV file
+        output_path: Output WAV path
+    """
+    params1: Optional[PcmParams]
+    params2: Optional[PcmParams]
+    try:
+        params1, offset1, size1 = wav_data_range(path1)
+        params2, offset2, size2 = wav_data_range(path2)
+    except wave.Error:
+        params1 = params2 = None
+
+    if params1 is not None and params1 == params2:
+        concat_wavs(output_path, params1, [(path1, offset1, size1), (path2, offset2, size2)])
+        return
+
+    from pydub import AudioSegment
+
+    combined = AudioSegment.from_wav(path1) + AudioSegment.from_wav(path2)
+    combined.export(output_path, format="wav")
+
+
 class AudioMerger:
     """Handles merging of audio segments."""
 
@@ -31,6 +66,7 @@ class AudioMerger:
         """
         self.config = config
         self.keep_first = config.keep_first_segment
+        self.max_workers = max(1, config.max_workers)
 
     def run(
         self,
@@ -49,87 +85,105 @@ class AudioMerger:
         Returns:
             Tuple of (output_dir, metadata_path)
         """
-        logger.info("=" * 60)
+        logger.info(SEPARATOR)
         logger.info("STEP 2: MERGING AUDIO SEGMENTS")
-        logger.info("=" * 60)
+        logger.info(SEPARATOR)
 
         output_dir = os.path.join(output_base_dir, self.config.output_subdir)
         ensure_dir(output_dir)
 
-        # Read input metadata
-        with open(input_metadata, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f, delimiter='|')
-            next(reader)  # Skip header
-            data = [row for row in reader if len(row) >= 2]
+        # Stream input metadata; only the current pair is held in memory
+        segments = (row for row in iter_metadata_rows(input_metadata) if len(row) >= 2)
+        first_segment = next(segments, None)
 
-        if not data:
+        if first_segment is None:
             logger.warning("No data found in metadata")
             return output_dir, None
 
-        new_dataset = []
+        input_count = 1
         new_index = 0
 
-        # Handle first segment
-        first_segment = data[0]
-        remaining_segments = data[1:]
-
-        if self.keep_first:
-            logger.info(f"Keeping first segment: {first_segment[0]}")
-            src_audio_path = os.path.join(input_dir, first_segment[0])
-            audio = AudioSegment.from_wav(src_audio_path)
-
-            new_filename = f"merged_{new_index:04d}.wav"
-            new_path = os.path.join(output_dir, new_filename)
-            audio.export(new_path, format="wav")
-
-            new_dataset.append([new_filename, first_segment[1]])
-            new_index += 1
-        else:
-            logger.info(f"Discarding first segment: {first_segment[0]}")
-
-        # Merge pairs
-        logger.info(f"Merging {len(remaining_segments)} segments in pairs...")
-
-        for i in tqdm(range(0, len(remaining_segments), 2), desc="Merging"):
-            item1 = remaining_segments[i]
-            file1, text1 = item1[0], item1[1]
-
-            # Check if there's a pair
-            if i + 1 < len(remaining_segments):
-                item2 = remaining_segments[i + 1]
-                file2, text2 = item2[0], item2[1]
-
-                # Load and merge audio
-                audio1 = AudioSegment.from_wav(os.path.join(input_dir, file1))
-                audio2 = AudioSegment.from_wav(os.path.join(input_dir, file2))
-                combined_audio = audio1 + audio2
-                combined_text = f"{text1} {text2}"
-            else:
-                # Odd number: keep last one as-is
-                audio1 = AudioSegment.from_wav(os.path.join(input_dir, file1))
-                combined_audio = audio1
-                combined_text = text1
-
-            # Save merged segment
-            new_filename = f"merged_{new_index:04d}.wav"
-            output_path = os.path.join(output_dir, new_filename)
-            combined_audio.export(output_path, format="wav")
-            new_dataset.append([new_filename, combined_text])
-            new_index += 1
-
-        # Write metadata
+        # Rows are written as each merged file is produced
         metadata_path = os.path.join(output_dir, self.config.metadata_file)
-        with open(metadata_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f, delimiter='|')
-            writer.writerow(["file_name", "text"])
-            writer.writerows(new_dataset)
-
-        logger.info(f"\n{'=' * 60}")
+        with BatchCsvWriter(metadata_path, ["file_name", "text"]) as metadata:
+            # Handle first segment
+            if self.keep_first:
+                logger.info(f"Keeping first segment: {first_segment[0]}")
+                src_audio_path = os.path.join(input_dir, first_segment[0])
+
+                new_filename = f"merged_{new_index:04d}.wav"
+                new_path = os.path.join(output_dir, new_filename)
+                shutil.copyfile(src_audio_path, new_path)
+
+                metadata.add([new_filename, first_segment[1]])
+                new_index += 1
+            else:
+                logger.info(f"Discarding first segment: {first_segment[0]}")
+
+            # Merge pairs: zipping the iterator with itself yields consecutive rows
+            remaining = count_metadata_rows(input_metadata) - 1
+            logger.info(f"Merging ~{remaining} segments in pairs...")
+
+            # Each pair is file I/O (sendfile for same-format pairs), so pairs
+            # are merged on a thread pool. Rows are written in input order as
+            # the oldest pending merge completes, with at most 2 * max_workers
+            # merges in flight.
+            pending: Deque[Tuple["concurrent.futures.Future[Any]", str, str]] = collections.deque()
+
+            # Directory prefixes ending in a separator, so the loop builds
+            # paths by concatenation instead of os.path.join
+            in_prefix = os.path.join(input_dir, "")
+            out_prefix = os.path.join(output_dir, "")
+
+            def finish_oldest() -> None:
+                future, filename, text = pending.popleft()
+                future.result()
+                metadata.add([filename, text])
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for item1, item2 in tqdm(
+                    itertools.zip_longest(segments, segments),
+                    total=(remaining + 1) // 2,
+                    desc="Merging"
+                ):
+                    file1, text1 = item1[0], item1[1]
+
+                    new_filename = f"merged_{new_index:04d}.wav"
+                    output_path = out_prefix + new_filename
+
+                    future: "concurrent.futures.Future[Any]"
+                    # Check if there's a pair
+                    if item2 is not None:
+                        file2, text2 = item2[0], item2[1]
+                        input_count += 2
+
+                        # Merge audio
+                        future = executor.submit(
+                            _merge_wavs, in_prefix + file1, in_prefix + file2, output_path
+                        )
+                        combined_text = f"{text1} {text2}"
+                    else:
+                        # Odd number: keep last one as-is
+                        input_count += 1
+                        future = executor.submit(shutil.copyfile, in_prefix + file1, output_path)
+                        combined_text = text1
+
+                    # Save merged segment
+                    pending.append((future, new_filename, combined_text))
+                    new_index += 1
+
+                    if len(pending) >= 2 * self.max_workers:
+                        finish_oldest()
+
+                while pending:
+                    finish_oldest()
+
+        logger.info(f"\n{SEPARATOR}")
         logger.info("Merging Summary:")
-        logger.info(f"  Input segments: {len(data)}")
-        logger.info(f"  Merged files created: {len(new_dataset)}")
+        logger.info(f"  Input segments: {input_count}")
+        logger.info(f"  Merged files created: {metadata.count}")
         logger.info(f"  Output directory: {output_dir}")
         logger.info(f"  Metadata file: {metadata_path}")
-        logger.info(f"{'=' * 60}\n")
+        logger.info(f"{SEPARATOR}\n")
 
         return output_dir, metadata_path
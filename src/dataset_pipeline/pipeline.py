@@ -4,20 +4,47 @@ Main pipeline orchestrator.
 Coordinates all steps of the dataset creation pipeline.
 """
 
+import os
+import json
+import hashlib
 import logging
+from dataclasses import asdict, fields
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Tuple
 
 from .config import Config
-from .chunker import AudioChunker
-from .merger import AudioMerger
-from .validator import TranscriptionValidator
-from .utils import find_audio_srt_pairs, ensure_dir
+from .utils import WIDE_SEPARATOR, find_audio_srt_pairs, ensure_dir
+
+if TYPE_CHECKING:
+    from .chunker import AudioChunker
+    from .merger import AudioMerger
+    from .validator import TranscriptionValidator
 
 
 logger = logging.getLogger(__name__)
 
 
+def _stage_key(stage: str, config_section: Any, inputs: Iterable[str]) -> str:
+    """
+    Fingerprint a stage's settings and input files.
+
+    Args:
+        stage: Stage name
+        config_section: Dataclass holding the stage's configuration
+        inputs: Paths of the files the stage reads
+
+    Returns:
+        Hex digest that changes when the settings or any input file changes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(stage.encode())
+    digest.update(json.dumps(asdict(config_section), sort_keys=True).encode())
+    for path in sorted(inputs):
+        stat = os.stat(path)
+        digest.update(f"\0{path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode())
+    return digest.hexdigest()
+
+
 class DatasetPipeline:
     """Main pipeline orchestrator."""
 
@@ -34,22 +61,86 @@ class DatasetPipeline:
         if not Path(config.input_dir).exists():
             raise ValueError(f"Input directory does not exist: {config.input_dir}")
 
-        # Create output directory
+        # Create the output directory (and the cache) up front, so an
+        # unwritable location fails before any step has run; each step
+        # resolves and creates its own output_subdir
         ensure_dir(config.output_dir)
+        if config.use_cache:
+            ensure_dir(config.stage_dir(".cache"))
 
         # Initialize processors based on enabled steps
-        self.chunker: Optional[AudioChunker] = None
-        self.merger: Optional[AudioMerger] = None
-        self.validator: Optional[TranscriptionValidator] = None
+        # Step modules are imported only when enabled; the validator in
+        # particular pulls in hazm and openai
+        self.chunker: Optional["AudioChunker"] = None
+        self.merger: Optional["AudioMerger"] = None
+        self.validator: Optional["TranscriptionValidator"] = None
 
         if config.steps.chunking:
-            self.chunker = AudioChunker(config.chunking)
+            from . import chunker
+            self.chunker = chunker.AudioChunker(config.chunking)
 
         if config.steps.merging:
-            self.merger = AudioMerger(config.merging)
+            from . import merger
+            self.merger = merger.AudioMerger(config.merging)
 
         if config.steps.validation:
-            self.validator = TranscriptionValidator(config.validation)
+            from . import validator
+            self.validator = validator.TranscriptionValidator(config.validation)
+
+    def _run_stage(
+        self,
+        stage: str,
+        config_section: Any,
+        inputs: Iterable[str],
+        run_stage: Callable[[], Tuple[str, str]],
+        succeeded: Callable[[], bool] = lambda: True
+    ) -> Tuple[str, str]:
+        """
+        Run a stage, or reuse its outputs from an earlier run with the same key.
+
+        Args:
+            stage: Stage name, used for the manifest file name
+            config_section: Dataclass holding the stage's configuration
+            inputs: Paths of the files the stage reads
+            run_stage: Callable running the stage and returning its two output paths
+            succeeded: Called after run_stage; a run it reports as failed (e.g.
+                files skipped on errors) is not recorded, so it reruns next time
+
+        Returns:
+            The stage's two output paths
+        """
+        if not self.config.use_cache:
+            return run_stage()
+
+        try:
+            key = _stage_key(stage, config_section, inputs)
+        except (OSError, TypeError):
+            # Missing input: let the stage itself report it
+            return run_stage()
+        manifest_path = Path(self.config.stage_dir(".cache")) / f"{stage}.json"
+
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            outputs = tuple(manifest["outputs"])
+            if manifest["key"] == key and all(p and os.path.exists(p) for p in outputs):
+                logger.info(f"\nReusing cached {stage} outputs ({manifest_path})")
+                return outputs
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        # Drop the old manifest first so an interrupted run can't be mistaken
+        # for a complete one
+        manifest_path.unlink(missing_ok=True)
+
+        outputs = run_stage()
+
+        if all(outputs) and succeeded():
+            ensure_dir(str(manifest_path.parent))
+            tmp_path = manifest_path.with_name(f"{manifest_path.name}.tmp")
+            tmp_path.write_text(json.dumps({"key": key, "outputs": outputs}), encoding="utf-8")
+            os.replace(tmp_path, manifest_path)
+
+        return outputs
 
     def run(self) -> dict:
         """
@@ -58,13 +149,14 @@ class DatasetPipeline:
         Returns:
             Dictionary with pipeline results and statistics
         """
-        logger.info("=" * 80)
+        logger.info(WIDE_SEPARATOR)
         logger.info("DATASET CREATION PIPELINE STARTED")
-        logger.info("=" * 80)
+        logger.info(WIDE_SEPARATOR)
         logger.info(f"Input directory: {self.config.input_dir}")
         logger.info(f"Output directory: {self.config.output_dir}")
-        logger.info(f"Steps enabled: {[k for k, v in vars(self.config.steps).items() if v]}")
-        logger.info("=" * 80)
+        steps = self.config.steps
+        logger.info(f"Steps enabled: {[f.name for f in fields(steps) if getattr(steps, f.name)]}")
+        logger.info(WIDE_SEPARATOR)
 
         results = {
             "input_dir": self.config.input_dir,
@@ -74,9 +166,9 @@ class DatasetPipeline:
         }
 
         # Find audio-SRT pairs
-        logger.info("\n" + "=" * 80)
+        logger.info("\n" + WIDE_SEPARATOR)
         logger.info("FINDING AUDIO FILES")
-        logger.info("=" * 80)
+        logger.info(WIDE_SEPARATOR)
 
         pairs = find_audio_srt_pairs(self.config.input_dir)
 
@@ -91,52 +183,61 @@ class DatasetPipeline:
         current_metadata = None
 
         if self.config.steps.chunking and self.chunker:
-            current_dir, current_metadata = self.chunker.run(pairs, self.config.output_dir)
+            chunker = self.chunker
+            current_dir, current_metadata = self._run_stage(
+                "chunking",
+                self.config.chunking,
+                [path for pair in pairs for path in pair],
+                lambda: chunker.run(pairs, self.config.output_dir),
+                lambda: chunker.errors == 0
+            )
             results["steps_completed"].append("chunking")
             results["chunking_output_dir"] = current_dir
             results["chunking_metadata"] = current_metadata
         else:
-            logger.info("\n" + "=" * 80)
+            logger.info("\n" + WIDE_SEPARATOR)
             logger.info("Chunking step disabled, skipping...")
-            logger.info("=" * 80)
+            logger.info(WIDE_SEPARATOR)
             return results
 
         # Step 2: Merging (optional)
         if self.config.steps.merging and self.merger:
-            current_dir, current_metadata = self.merger.run(
-                current_dir,
-                current_metadata,
-                self.config.output_dir
+            merger = self.merger
+            current_dir, current_metadata = self._run_stage(
+                "merging",
+                self.config.merging,
+                [current_metadata],
+                lambda: merger.run(current_dir, current_metadata, self.config.output_dir)
             )
             results["steps_completed"].append("merging")
             results["merging_output_dir"] = current_dir
             results["merging_metadata"] = current_metadata
         else:
-            logger.info("\n" + "=" * 80)
+            logger.info("\n" + WIDE_SEPARATOR)
             logger.info("Merging step disabled, skipping...")
-            logger.info("=" * 80)
+            logger.info(WIDE_SEPARATOR)
 
         # Step 3: Validation
+        # Never cached: its results depend on the Whisper servers, and a run
+        # against a server that was down flags every row instead of failing
         if self.config.steps.validation and self.validator:
             validated_path, flagged_path = self.validator.run(
-                current_dir,
-                current_metadata,
-                self.config.output_dir
+                current_dir, current_metadata, self.config.output_dir
             )
             results["steps_completed"].append("validation")
             results["validated_metadata"] = validated_path
             results["flagged_files"] = flagged_path
         else:
-            logger.info("\n" + "=" * 80)
+            logger.info("\n" + WIDE_SEPARATOR)
             logger.info("Validation step disabled, skipping...")
-            logger.info("=" * 80)
+            logger.info(WIDE_SEPARATOR)
 
         # Final summary
-        logger.info("\n" + "=" * 80)
+        logger.info("\n" + WIDE_SEPARATOR)
         logger.info("PIPELINE COMPLETED SUCCESSFULLY")
-        logger.info("=" * 80)
+        logger.info(WIDE_SEPARATOR)
         logger.info(f"Steps completed: {', '.join(results['steps_completed'])}")
         logger.info(f"Output directory: {self.config.output_dir}")
-        logger.info("=" * 80 + "\n")
+        logger.info(WIDE_SEPARATOR + "\n")
 
         return results
@@ -3,16 +3,35 @@ Utility functions for the dataset pipeline.
 """
 
 import os
+import re
+import csv
 import logging
 from pathlib import Path
-from typing import Iterable, List, Tuple, Union
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 
 logger = logging.getLogger(__name__)
 
 
+# Banner lines framing each step's log output
+SEPARATOR = "=" * 60
+WIDE_SEPARATOR = "=" * 80
+
 SUPPORTED_AUDIO_EXTS: Tuple[str, ...] = (".wav", ".mp3")
 
+# SRT names tried for an audio file "<stem>.<ext>", in order of preference
+SRT_SUFFIXES: Tuple[str, ...] = (".srt", ".fa.srt", ".en.srt")
+
+# Read buffer for metadata files; large CSVs are read in few big chunks
+_READ_BUFSIZE = 1 << 20
+
+# Characters not allowed in file names on common filesystems
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Characters that force quoting with csv.writer(delimiter='|') defaults
+_CSV_NEEDS_QUOTING = re.compile(r'[|"\r\n]')
+_CSV_QUOTE_OR_NEWLINE = re.compile(r'["\r\n]')
+
 
 def find_audio_srt_pairs(
     input_dir: str,
@@ -36,34 +55,40 @@ def find_audio_srt_pairs(
     if not input_path.exists():
         raise ValueError(f"Input directory does not exist: {input_dir}")
 
+    extensions: Tuple[str, ...]
     if isinstance(audio_ext, str):
         extensions = (audio_ext,)
     else:
         extensions = tuple(audio_ext)
-
-    audio_files: List[Path] = []
-    seen = set()
-    for ext in extensions:
-        normalized = ext if ext.startswith(".") else f".{ext}"
-        for match in input_path.glob(f"*{normalized}"):
-            resolved = match.resolve()
-            if resolved not in seen:
-                seen.add(resolved)
-                audio_files.append(match)
-
-    audio_files.sort()
+    extensions = tuple(ext if ext.startswith(".") else f".{ext}" for ext in extensions)
+
+    # One directory scan; SRT lookups below are set membership tests instead
+    # of a stat call per candidate. is_file() is answered from the directory
+    # entry type on most platforms, so it doesn't add a stat either.
+    with os.scandir(input_path) as entries:
+        names = {entry.name for entry in entries if entry.is_file()}
+
+    # Hidden files are skipped, as glob("*.wav") would
+    audio_names = sorted(
+        name for name in names
+        if name.endswith(extensions) and not name.startswith(".")
+    )
     pairs = []
     missing_srt = []
 
-    for audio_path in audio_files:
-        srt_path = find_srt_for_audio(audio_path)
+    for audio_name in audio_names:
+        stem = Path(audio_name).stem
+        srt_name = next(
+            (stem + suffix for suffix in SRT_SUFFIXES if stem + suffix in names), None
+        )
+        audio_path = input_path / audio_name
 
-        if srt_path:
-            pairs.append((str(audio_path), str(srt_path)))
-            logger.debug(f"  ✓ Found pair: {audio_path.name} + {srt_path.name}")
+        if srt_name:
+            pairs.append((str(audio_path), str(input_path / srt_name)))
+            logger.debug(f"  ✓ Found pair: {audio_name} + {srt_name}")
         else:
             missing_srt.append(str(audio_path))
-            logger.warning(f"  ✗ No SRT found for: {audio_path.name}")
+            logger.warning(f"  ✗ No SRT found for: {audio_name}")
 
     logger.info(f"\nFound {len(pairs)} audio-SRT pairs")
     if missing_srt:
@@ -72,7 +97,7 @@ def find_audio_srt_pairs(
     return pairs
 
 
-def find_srt_for_audio(audio_path: Path) -> Path | None:
+def find_srt_for_audio(audio_path: Path) -> Optional[Path]:
     """
     Find corresponding SRT file for an audio file.
 
@@ -87,17 +112,13 @@ def find_srt_for_audio(audio_path: Path) -> Path | None:
     Returns:
         Path to SRT file or None if not found
     """
-    # Try different SRT naming patterns
-    srt_candidates = [
-        audio_path.with_suffix('.srt'),
-        audio_path.with_suffix('.fa.srt'),
-        audio_path.with_name(audio_path.stem + '.fa.srt'),
-        audio_path.with_name(audio_path.stem + '.en.srt'),
-    ]
-
-    for candidate in srt_candidates:
-        if candidate.exists():
-            return candidate
+    # Build candidates as plain strings; a Path is only made for the match
+    parent = os.fspath(audio_path.parent)
+    stem = audio_path.stem
+    for suffix in SRT_SUFFIXES:
+        candidate = os.path.join(parent, stem + suffix)
+        if os.path.exists(candidate):
+            return Path(candidate)
 
     return None
 
@@ -128,7 +149,9 @@ def validate_file_exists(filepath: str, file_type: str = "File") -> bool:
     Returns:
         True if exists, raises FileNotFoundError otherwise
     """
-    if not os.path.exists(filepath):
+    # os.access skips the stat_result object and exception handling that
+    # os.path.exists goes through
+    if not os.access(filepath, os.F_OK):
         raise FileNotFoundError(f"{file_type} not found: {filepath}")
     return True
 
@@ -162,9 +185,128 @@ def safe_filename(filename: str) -> str:
     Returns:
         Safe filename
     """
-    import re
     # Remove invalid characters
-    safe = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    safe = _UNSAFE_FILENAME_RE.sub('_', filename)
     # Remove leading/trailing spaces and dots
     safe = safe.strip('. ')
     return safe
+
+
+def iter_metadata_rows(metadata_path: str) -> Iterator[List[str]]:
+    """
+    Stream rows of a pipe-delimited metadata CSV, skipping the header.
+
+    Args:
+        metadata_path: Path to metadata CSV
+
+    Yields:
+        One list of fields per data row
+    """
+    with open(
+        metadata_path, 'r', newline='', encoding='utf-8', buffering=_READ_BUFSIZE
+    ) as f:
+        reader = csv.reader(f, delimiter='|')
+        next(reader, None)  # Skip header
+        yield from reader
+
+
+def count_metadata_rows(metadata_path: str) -> int:
+    """
+    Count data rows in a metadata CSV without parsing it.
+
+    Counts line breaks, so rows with quoted multi-line text are counted more
+    than once; the result is meant for progress bars.
+
+    Args:
+        metadata_path: Path to metadata CSV
+
+    Returns:
+        Approximate number of data rows
+    """
+    lines = 0
+    with open(metadata_path, 'rb') as f:
+        for block in iter(lambda: f.read(_READ_BUFSIZE), b''):
+            lines += block.count(b'\n')
+    return max(lines - 1, 0)
+
+
+def _csv_field(value: Any) -> str:
+    """Format one field the way csv.writer(delimiter='|') would."""
+    if value is None:
+        return ""
+    text = value if isinstance(value, str) else str(value)
+    if _CSV_NEEDS_QUOTING.search(text):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+class BatchCsvWriter:
+    """
+    Pipe-delimited metadata writer that buffers formatted rows.
+
+    Produces the same bytes as ``csv.writer(f, delimiter='|')`` but joins rows
+    itself and writes them to disk in batches, so callers can emit rows as they
+    are produced instead of collecting them in a list first.
+    """
+
+    def __init__(self, path: str, header: Sequence[str], batch_size: int = 4096):
+        """
+        Open the output file and write the header row.
+
+        Args:
+            path: Output CSV path
+            header: Column names
+            batch_size: Number of rows buffered before each write
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer: List[str] = []
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._file.write(self._format(header))
+
+    @staticmethod
+    def _format(row: Sequence[Any]) -> str:
+        # Common case: all fields are strings and none needs quoting, which
+        # one scan of the joined line can tell (no extra '|', quote or newline)
+        try:
+            line = "|".join(row)
+        except TypeError:
+            line = None
+        if (line is not None and line.count("|") == len(row) - 1
+                and not _CSV_QUOTE_OR_NEWLINE.search(line)):
+            return line + "\r\n"
+        return "|".join(map(_csv_field, row)) + "\r\n"
+
+    def add(self, row: Sequence[Any]) -> None:
+        """Queue one row, flushing the buffer when it is full."""
+        self._buffer.append(self._format(row))
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Queue several rows."""
+        before = len(self._buffer)
+        self._buffer.extend(map(self._format, rows))
+        self.count += len(self._buffer) - before
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows to the file."""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+
+    def close(self) -> None:
+        """Flush remaining rows and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "BatchCsvWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -5,26 +5,57 @@ Validates transcriptions using dual Whisper models via vllm.
 """
 
 import os
-import csv
 import re
+import sys
+import asyncio
 import logging
+import functools
 from pathlib import Path
-from typing import List, Tuple, Optional
-import concurrent.futures
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Optional, Union
 
-from openai import OpenAI
+import httpx
+from openai import APIConnectionError, AsyncOpenAI
 from hazm import Normalizer
 from tqdm import tqdm
 
 from .config import ValidationConfig
+from .utils import SEPARATOR, BatchCsvWriter, count_metadata_rows, iter_metadata_rows
 
 
 logger = logging.getLogger(__name__)
 
+# Widest boundary window whose words are interned
+_INTERN_MAX_WINDOW = 5
+
+
+def _intern_words(words: Iterable[str]) -> Tuple[str, ...]:
+    """Tuple of interned words."""
+    return tuple(map(sys.intern, words))
+
+
+def _file_size(path: str) -> int:
+    """Size of a file, or 0 if it is gone (process_single_row reports it)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read a whole file (run off the event loop)."""
+    with open(path, "rb") as f:
+        return f.read()
+
 
 class TranscriptionValidator:
     """Validates transcriptions using dual Whisper models."""
 
+    # Anything that is not a word char, whitespace or Persian/Arabic letter
+    _PUNCT_RE = re.compile(r'[^\w\s\u0600-\u06FF]+')
+    _WS_RE = re.compile(r'\s+')
+    # Text hazm leaves untouched (it rewrites ASCII digits, quotes and dots)
+    _LATIN_WORDS_RE = re.compile(r'[A-Za-z\s]*')
+
     def __init__(self, config: ValidationConfig):
         """
         Initialize TranscriptionValidator.
@@ -34,29 +65,44 @@ class TranscriptionValidator:
         """
         self.config = config
 
-        # Initialize API clients
-        logger.info("Initializing Whisper API clients...")
-
-        self.client_primary = OpenAI(
-            base_url=f"http://localhost:{config.primary_port}/v1",
-            api_key="EMPTY",
-            timeout=60.0
-        )
+        # API clients are bound to the event loop that uses them, so they are
+        # created by run() (see _create_clients)
+        self.client_primary: Optional[AsyncOpenAI] = None
         self.model_primary = config.primary_model
 
-        self.client_secondary = OpenAI(
-            base_url=f"http://localhost:{config.secondary_port}/v1",
-            api_key="EMPTY",
-            timeout=60.0
-        )
+        self.client_secondary: Optional[AsyncOpenAI] = None
         self.model_secondary = config.secondary_model
 
         # Text normalizer
         self.normalizer = Normalizer()
+        self._hazm_normalize = self.normalizer.normalize
 
         self.boundary_window = config.boundary_window
+        # Interned words let the boundary comparisons in process_single_row
+        # succeed on identity instead of comparing Unicode strings; with wide
+        # windows that mostly grows the intern table, so plain tuples are used
+        self._words_of: Callable[[Iterable[str]], Tuple[str, ...]] = (
+            _intern_words if 0 < self.boundary_window <= _INTERN_MAX_WINDOW else tuple
+        )
         self.language = config.language
         self.max_workers = config.max_workers
+        # Requests in flight per server, within the max_workers rows in flight;
+        # the secondary only sees disagreements, so it can run with a smaller
+        # --max-num-seqs than the primary
+        self.primary_max_concurrency = config.primary_max_concurrency or self.max_workers
+        self.secondary_max_concurrency = config.secondary_max_concurrency or self.max_workers
+        self._request_slots: Dict[AsyncOpenAI, asyncio.Semaphore] = {}
+        self.speculative_secondary = config.speculative_secondary
+        self.skip_secondary_on_full_mismatch = config.skip_secondary_on_full_mismatch
+        self.min_audio_bytes = config.min_audio_bytes
+        self.sort_by_size = config.sort_by_size
+
+        # Per-instance memoization: SRT lines and short transcripts repeat a lot
+        # across rows, and both functions are pure. text_cache_size is the
+        # number of distinct texts each cache keeps (0 disables caching)
+        cache_size = config.text_cache_size
+        self._normalize_cached = functools.lru_cache(maxsize=cache_size)(self._normalize)
+        self._boundaries_cached = functools.lru_cache(maxsize=cache_size)(self._boundaries)
 
         logger.info(f"  Primary: {self.model_primary} on port {config.primary_port}")
         logger.info(f"  Secondary: {self.model_secondary} on port {config.secondary_port}")
@@ -73,14 +119,24 @@ class TranscriptionValidator:
         """
         if not text:
             return ""
-        text = str(text)
-        text = self.normalizer.normalize(text)
+        if type(text) is not str:
+            text = str(text)
+        return self._normalize_cached(text)
+
+    def _normalize(self, text: str) -> str:
+        """Uncached body of normalize_text."""
+        # English-only transcripts (e.g. model fallbacks) only need whitespace
+        # collapsing; skip the hazm pass for them
+        if text.isascii() and self._LATIN_WORDS_RE.fullmatch(text):
+            return self._WS_RE.sub(' ', text).strip()
+
+        text = self._hazm_normalize(text)
         # Keep Persian chars, digits, and spaces
-        text = re.sub(r'[^\w\s\u0600-\u06FF]+', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = self._PUNCT_RE.sub('', text)
+        text = self._WS_RE.sub(' ', text).strip()
         return text
 
-    def get_boundaries(self, text: str) -> Tuple[List[str], List[str]]:
+    def get_boundaries(self, text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
         """
         Get first N and last N words from text.
 
@@ -90,16 +146,95 @@ class TranscriptionValidator:
         Returns:
             Tuple of (first_words, last_words)
         """
-        words = text.split()
-        if len(words) <= self.boundary_window * 2:
+        return self._boundaries_cached(text)
+
+    def _boundaries(self, text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Uncached body of get_boundaries."""
+        words_of = self._words_of
+        w = self.boundary_window
+        if w > 0:
+            # Split at most 2*w words off the front; the remainder (if any) is
+            # left unsplit and the last w words come from one rsplit
+            head = text.split(maxsplit=2 * w)
+            if len(head) > 2 * w:
+                return words_of(head[:w]), words_of(text.rsplit(maxsplit=w)[1:])
+            words = words_of(head)
             return words, words
-        return words[:self.boundary_window], words[-self.boundary_window:]
+        all_words = tuple(text.split())
+        if len(all_words) <= self.boundary_window * 2:
+            return all_words, all_words
+        return all_words[:self.boundary_window], all_words[-self.boundary_window:]
+
+    def _create_clients(self) -> Tuple[AsyncOpenAI, AsyncOpenAI]:
+        """
+        Create async API clients for both Whisper servers.
+
+        The SDK retries timeouts, connection errors, 429s and 5xx responses up
+        to ``max_retries`` times with jittered exponential backoff, so a busy
+        vllm server delays a row instead of flagging it.
+
+        Returns:
+            Tuple of (primary_client, secondary_client)
+        """
+        logger.info("Initializing Whisper API clients...")
+
+        # Both clients share one connection pool (connections stay per server)
+        http_client = self._create_http_client()
+        # A short connect timeout fails fast on a server that is down; the read
+        # timeout bounds a stalled transcription before it is retried
+        timeout = httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout)
+        client_primary = AsyncOpenAI(
+            base_url=f"http://localhost:{self.config.primary_port}/v1",
+            api_key="EMPTY",
+            timeout=timeout,
+            max_retries=self.config.max_retries,
+            http_client=http_client
+        )
+        client_secondary = AsyncOpenAI(
+            base_url=f"http://localhost:{self.config.secondary_port}/v1",
+            api_key="EMPTY",
+            timeout=timeout,
+            max_retries=self.config.max_retries,
+            http_client=http_client
+        )
+        return client_primary, client_secondary
 
-    def transcribe(
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """
+        Create the connection pool shared by both API clients.
+
+        The pool allows as many connections as the two servers' request
+        limits add up to (``2 * max_workers`` by default, enough for a primary
+        and a speculative secondary request per row), and all of them may be
+        kept alive: requests reuse open connections to either server instead
+        of queueing for one or opening new ones. At most ``max_workers`` rows
+        are validated at once, so neither server ever gets more than
+        ``max_workers`` requests, whatever ``primary_max_concurrency`` and
+        ``secondary_max_concurrency`` are set to.
+
+        Idle connections are kept for ``keepalive_expiry`` seconds: the
+        secondary server is only hit on disagreements, and httpx's 5s default
+        would let its connections lapse between them. vllm serves HTTP/1.1
+        only, so HTTP/2 is not enabled.
+
+        Returns:
+            Configured httpx.AsyncClient
+        """
+        connections = self.primary_max_concurrency + self.secondary_max_concurrency
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=connections,
+                max_keepalive_connections=connections,
+                keepalive_expiry=self.config.keepalive_expiry
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=0)
+        )
+
+    async def transcribe(
         self,
-        client: OpenAI,
+        client: AsyncOpenAI,
         model_name: str,
-        audio_path: str
+        audio: Union[str, Tuple[str, bytes]]
     ) -> Optional[str]:
         """
         Transcribe audio using Whisper model.
@@ -107,34 +242,73 @@ class TranscriptionValidator:
         Args:
             client: OpenAI client
             model_name: Model name
-            audio_path: Path to audio file
+            audio: Path to audio file, or (filename, data) already read by
+                _load_audio
 
         Returns:
             Transcribed text or None on error
         """
+        if isinstance(audio, str):
+            loaded = await self._load_audio(audio)
+            if loaded is None:
+                return None
+        else:
+            loaded = audio
+        # Per-server request limit, set while _validate_rows is running
+        slots = self._request_slots.get(client)
         try:
-            with open(audio_path, "rb") as f:
-                response = client.audio.transcriptions.create(
+            if slots is not None:
+                await slots.acquire()
+            try:
+                response = await client.audio.transcriptions.create(
                     model=model_name,
-                    file=f,
+                    file=loaded,
                     language=self.language
                 )
+            finally:
+                if slots is not None:
+                    slots.release()
             return self.normalize_text(response.text)
+        except APIConnectionError as e:
+            # Includes timeouts; only raised once the client's retries are spent
+            logger.error(
+                f"Transcription error for {loaded[0]} after "
+                f"{self.config.max_retries} retries: {e}"
+            )
+            return None
         except Exception as e:
-            logger.error(f"Transcription error for {Path(audio_path).name}: {e}")
+            logger.error(f"Transcription error for {loaded[0]}: {e}")
             return None
 
-    def process_single_row(
+    async def _load_audio(self, audio_path: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Read an audio file off the event loop.
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Tuple of (filename, data) or None on error
+        """
+        filename = Path(audio_path).name
+        try:
+            loop = asyncio.get_running_loop()
+            return filename, await loop.run_in_executor(None, _read_bytes, audio_path)
+        except OSError as e:
+            logger.error(f"Could not read {filename}: {e}")
+            return None
+
+    async def process_single_row(
         self,
         row: List[str],
-        dataset_dir: str
+        filepath: str
     ) -> Optional[Tuple[str, List]]:
         """
         Process a single audio file for validation.
 
         Args:
             row: CSV row [filename, text]
-            dataset_dir: Directory containing audio files
+            filepath: Path to the row's audio file (already known to exist)
 
         Returns:
             Tuple of (status, result_list) or None
@@ -144,57 +318,193 @@ class TranscriptionValidator:
 
         filename = row[0]
         original_raw_text = row[1]
-        filepath = os.path.join(dataset_dir, filename)
-
-        if not os.path.exists(filepath):
-            logger.warning(f"File not found: {filepath}")
-            return None
 
         # Normalize SRT text
         original_srt = self.normalize_text(original_raw_text)
 
-        # Step 1: Transcribe with primary model (Large V3)
-        pred_primary = self.transcribe(self.client_primary, self.model_primary, filepath)
-
-        if pred_primary is None:
+        # Read the audio once; both models are sent the same bytes
+        audio = await self._load_audio(filepath)
+        if audio is None:
+            # Existence was checked against the directory scan in _iter_tasks;
+            # only a failed read is worth a stat to tell a file deleted since
+            # (skipped like other missing files) from an unreadable one
+            if not os.path.exists(filepath):
+                return None
             return ("FLAG", [filename, original_raw_text, "Error", "Error", "Primary Model Failed"])
 
-        # Check boundary match
-        srt_start, srt_end = self.get_boundaries(original_srt)
-        prim_start, prim_end = self.get_boundaries(pred_primary)
+        # Empty or truncated files are flagged without spending a GPU request;
+        # the size comes from the bytes just read, so no extra stat is needed
+        if len(audio[1]) < self.min_audio_bytes:
+            return ("FLAG", [filename, original_raw_text, "Skipped", "Skipped", "Audio Too Small"])
 
-        match_start = (srt_start == prim_start)
-        match_end = (srt_end == prim_end)
+        # Set by _validate_rows for the duration of a run
+        client_primary, client_secondary = self.client_primary, self.client_secondary
+        assert client_primary is not None and client_secondary is not None
 
-        # Perfect match: keep original
-        if match_start and match_end:
-            return ("VALID", [filename, original_raw_text])
+        # Optionally start the secondary model right away so its latency overlaps
+        # the primary call; the result is discarded if the primary matches the SRT.
+        secondary_task = None
+        if self.speculative_secondary:
+            secondary_task = asyncio.ensure_future(
+                self.transcribe(client_secondary, self.model_secondary, audio)
+            )
 
-        # Step 2: Disagreement - ask secondary model (Turbo)
-        pred_secondary = self.transcribe(self.client_secondary, self.model_secondary, filepath)
+        try:
+            # Step 1: Transcribe with primary model (Large V3)
+            pred_primary = await self.transcribe(client_primary, self.model_primary, audio)
+
+            if pred_primary is None:
+                return ("FLAG", [
+                    filename, original_raw_text, "Error", "Error", "Primary Model Failed"
+                ])
+
+            # Check boundary match
+            srt_start, srt_end = self.get_boundaries(original_srt)
+            prim_start, prim_end = self.get_boundaries(pred_primary)
+
+            match_start = (srt_start == prim_start)
+            match_end = (srt_end == prim_end)
+
+            # Perfect match: keep original
+            if match_start and match_end:
+                return ("VALID", [filename, original_raw_text])
+
+            # Neither boundary matches: optionally flag without asking the secondary
+            if self.skip_secondary_on_full_mismatch and not (match_start or match_end):
+                return ("FLAG", [
+                    filename, original_raw_text, pred_primary, "Skipped", "SRT Mismatch"
+                ])
+
+            # Step 2: Disagreement - ask secondary model (Turbo)
+            if secondary_task is not None:
+                pred_secondary = await secondary_task
+            else:
+                pred_secondary = await self.transcribe(
+                    client_secondary, self.model_secondary, audio
+                )
 
-        if pred_secondary is None:
-            return ("FLAG", [filename, original_raw_text, pred_primary, "Error", "Secondary Model Failed"])
+            if pred_secondary is None:
+                return ("FLAG", [
+                    filename, original_raw_text, pred_primary, "Error", "Secondary Model Failed"
+                ])
 
-        sec_start, sec_end = self.get_boundaries(pred_secondary)
+            sec_start, sec_end = self.get_boundaries(pred_secondary)
 
-        # Check model consensus
-        models_agree_start = (prim_start == sec_start)
-        models_agree_end = (prim_end == sec_end)
+            # Consensus: each boundary matches the SRT or the secondary backs the
+            # primary; the model comparison only runs for mismatched boundaries
+            consensus = (
+                (match_start or prim_start == sec_start)
+                and (match_end or prim_end == sec_end)
+            )
 
-        # Consensus logic
-        consensus = True
-        if not match_start and not models_agree_start:
-            consensus = False
-        if not match_end and not models_agree_end:
-            consensus = False
+            if consensus:
+                # Models agree: trust primary model (higher accuracy)
+                return ("VALID", [filename, pred_primary])
+            else:
+                # Disagreement: flag for manual review
+                return ("FLAG", [
+                    filename, original_raw_text, pred_primary, pred_secondary, "Model Disagreement"
+                ])
+        finally:
+            if secondary_task is not None and not secondary_task.done():
+                secondary_task.cancel()
+
+    def _iter_tasks(
+        self,
+        input_dir: str,
+        input_metadata: str
+    ) -> Iterator[Tuple[List[str], str]]:
+        """
+        Stream metadata rows paired with their audio paths.
 
-        if consensus:
-            # Models agree: trust primary model (higher accuracy)
-            return ("VALID", [filename, pred_primary])
-        else:
-            # Disagreement: flag for manual review
-            return ("FLAG", [filename, original_raw_text, pred_primary, pred_secondary, "Model Disagreement"])
+        Audio paths are resolved with one directory scan instead of a stat per
+        row; rows whose file is missing are skipped and reported at the end.
+
+        Args:
+            input_dir: Directory containing audio files
+            input_metadata: Path to input metadata CSV
+
+        Yields:
+            Tuple of (row, audio_path)
+        """
+        with os.scandir(input_dir) as entries:
+            existing = {entry.name: entry.path for entry in entries if entry.is_file()}
+
+        missing = 0
+        for row in iter_metadata_rows(input_metadata):
+            if len(row) < 2:
+                continue
+            filepath = existing.get(row[0])
+            if filepath is None:
+                logger.debug(f"File not found: {os.path.join(input_dir, row[0])}")
+                missing += 1
+                continue
+            yield row, filepath
+
+        if missing:
+            logger.warning(f"{missing} files listed in metadata not found in {input_dir}")
+
+    async def _validate_rows(
+        self,
+        tasks: Iterable[Tuple[List[str], str]],
+        total: int,
+        on_result: Callable[[Optional[Tuple[str, List]]], None]
+    ) -> int:
+        """
+        Validate rows concurrently on one event loop.
+
+        Rows are pulled from ``tasks`` lazily: at most ``max_workers`` rows are
+        being validated and at most twice that many are scheduled at any time.
+        Results are handed to ``on_result`` as they complete, so neither rows
+        nor results accumulate here.
+
+        Args:
+            tasks: Iterable of (row, audio_path) tuples
+            total: Expected number of rows (for the progress bar)
+            on_result: Called with each process_single_row result, in
+                completion order
+
+        Returns:
+            Number of rows processed
+        """
+        self.client_primary, self.client_secondary = self._create_clients()
+        self._request_slots = {
+            self.client_primary: asyncio.Semaphore(self.primary_max_concurrency),
+            self.client_secondary: asyncio.Semaphore(self.secondary_max_concurrency),
+        }
+        semaphore = asyncio.Semaphore(self.max_workers)
+        max_pending = 2 * self.max_workers
+        pending: Set["asyncio.Future[Optional[Tuple[str, List]]]"] = set()
+        processed = 0
+
+        async def process(row: List[str], filepath: str) -> Optional[Tuple[str, List]]:
+            async with semaphore:
+                return await self.process_single_row(row, filepath)
+
+        async def collect(return_when: str) -> None:
+            nonlocal pending, processed
+            done, pending = await asyncio.wait(pending, return_when=return_when)
+            for future in done:
+                on_result(future.result())
+            processed += len(done)
+            progress.update(len(done))
+
+        try:
+            with tqdm(total=total, desc="Validating") as progress:
+                for row, filepath in tasks:
+                    if len(pending) >= max_pending:
+                        await collect(asyncio.FIRST_COMPLETED)
+                    pending.add(asyncio.ensure_future(process(row, filepath)))
+                if pending:
+                    await collect(asyncio.ALL_COMPLETED)
+            return processed
+        finally:
+            for future in pending:
+                future.cancel()
+            # Closes the shared connection pool
+            await self.client_primary.close()
+            self.client_primary = self.client_secondary = None
+            self._request_slots = {}
 
     def run(
         self,
@@ -213,67 +523,52 @@ class TranscriptionValidator:
         Returns:
             Tuple of (validated_metadata_path, flagged_files_path)
         """
-        logger.info("=" * 60)
+        logger.info(SEPARATOR)
         logger.info("STEP 3: VALIDATING TRANSCRIPTIONS")
-        logger.info("=" * 60)
-
-        # Read input metadata
-        with open(input_metadata, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f, delimiter='|')
-            next(reader)  # Skip header
-            rows = list(reader)
-
-        valid_data = []
-        flagged_data = []
-
-        logger.info(f"Processing {len(rows)} files with {self.max_workers} workers...")
-
-        # Parallel processing
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(self.process_single_row, row, input_dir)
-                for row in rows
-            ]
-            results = []
-            for future in tqdm(
-                concurrent.futures.as_completed(futures),
-                total=len(rows),
-                desc="Validating"
-            ):
-                results.append(future.result())
-
-        # Sort results
-        for res in results:
-            if res is None:
-                continue
-            status, data = res
-            if status == "VALID":
-                valid_data.append(data)
-            else:
-                flagged_data.append(data)
+        logger.info(SEPARATOR)
 
-        # Save validated metadata
-        validated_path = os.path.join(output_base_dir, self.config.output_metadata)
-        with open(validated_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f, delimiter='|')
-            writer.writerow(["file_name", "text"])
-            writer.writerows(valid_data)
+        total = count_metadata_rows(input_metadata)
+        logger.info(f"Processing {total} files with {self.max_workers} workers...")
 
-        # Save flagged files
+        tasks: Iterable[Tuple[List[str], str]] = self._iter_tasks(input_dir, input_metadata)
+        if self.sort_by_size:
+            # Longest first (file size as a proxy for duration): vllm batches
+            # similar-length requests together and short files fill the last
+            # batches. Sorting needs every row in memory, hence opt-in.
+            tasks = sorted(tasks, key=lambda task: _file_size(task[1]), reverse=True)
+
+        validated_path = os.path.join(output_base_dir, self.config.output_metadata)
         flagged_path = os.path.join(output_base_dir, self.config.flagged_file)
-        with open(flagged_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f, delimiter='|')
-            writer.writerow(["file_name", "srt", "primary_v3", "secondary_turbo", "reason"])
-            writer.writerows(flagged_data)
 
-        logger.info(f"\n{'=' * 60}")
+        # Both files are written as results complete instead of from lists
+        # collected over the whole run
+        with BatchCsvWriter(validated_path, ["file_name", "text"]) as valid, \
+                BatchCsvWriter(
+                    flagged_path,
+                    ["file_name", "srt", "primary_v3", "secondary_turbo", "reason"]
+                ) as flagged:
+
+            def sort_result(res: Optional[Tuple[str, List]]) -> None:
+                if res is None:
+                    return
+                status, data = res
+                if status == "VALID":
+                    valid.add(data)
+                else:
+                    flagged.add(data)
+
+            # Concurrent processing: rows are streamed from the metadata file and
+            # requests share a single event loop
+            processed = asyncio.run(self._validate_rows(tasks, total, sort_result))
+
+        logger.info(f"\n{SEPARATOR}")
         logger.info("Validation Summary:")
-        logger.info(f"  Total files: {len(rows)}")
-        logger.info(f"  Valid: {len(valid_data)}")
-        logger.info(f"  Flagged: {len(flagged_data)}")
-        logger.info(f"  Success rate: {len(valid_data)/len(rows)*100:.1f}%")
+        logger.info(f"  Total files: {processed}")
+        logger.info(f"  Valid: {valid.count}")
+        logger.info(f"  Flagged: {flagged.count}")
+        logger.info(f"  Success rate: {valid.count/max(processed, 1)*100:.1f}%")
         logger.info(f"  Validated metadata: {validated_path}")
         logger.info(f"  Flagged files: {flagged_path}")
-        logger.info(f"{'=' * 60}\n")
+        logger.info(f"{SEPARATOR}\n")
 
         return validated_path, flagged_path
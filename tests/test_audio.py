@@ -0,0 +1,56 @@
+"""
+Tests for WAV helpers.
+"""
+
+import os
+import wave
+import tempfile
+from pathlib import Path
+
+from dataset_pipeline.audio import concat_wavs, wav_data_range, wav_header_template, write_wav
+
+
+class TestAudio:
+    """Tests for raw WAV I/O."""
+
+    def test_write_and_concat_wavs(self):
+        """Test that written and concatenated files are valid WAVs with the expected frames."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            params = (2, 2, 16000)
+            header = wav_header_template(params)
+
+            write_wav(str(tmppath / "a.wav"), header, b"\x01\x00" * 8)
+            write_wav(str(tmppath / "b.wav"), header, b"\x02\x00" * 4)
+
+            assert wav_data_range(str(tmppath / "a.wav")) == (params, 44, 16)
+
+            sources = []
+            for name in ("a.wav", "b.wav"):
+                _, data_offset, data_size = wav_data_range(str(tmppath / name))
+                sources.append((str(tmppath / name), data_offset, data_size))
+
+            concat_wavs(str(tmppath / "ab.wav"), params, sources)
+
+            with wave.open(str(tmppath / "ab.wav"), "rb") as wf:
+                assert wf.getnchannels() == 2
+                assert wf.getsampwidth() == 2
+                assert wf.getframerate() == 16000
+                assert wf.readframes(wf.getnframes()) == b"\x01\x00" * 8 + b"\x02\x00" * 4
+
+    def test_concat_wavs_without_kernel_copy(self, monkeypatch):
+        """Test the buffered copy used when copy_file_range/sendfile are unavailable."""
+        monkeypatch.delattr(os, "copy_file_range", raising=False)
+        monkeypatch.delattr(os, "sendfile", raising=False)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            params = (1, 2, 8000)
+            write_wav(str(tmppath / "a.wav"), wav_header_template(params), b"\x01\x02" * 5)
+
+            _, data_offset, data_size = wav_data_range(str(tmppath / "a.wav"))
+            source = (str(tmppath / "a.wav"), data_offset, data_size)
+            concat_wavs(str(tmppath / "aa.wav"), params, [source, source])
+
+            with wave.open(str(tmppath / "aa.wav"), "rb") as wf:
+                assert wf.readframes(wf.getnframes()) == b"\x01\x02" * 10
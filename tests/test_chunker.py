@@ -2,8 +2,10 @@
 Tests for audio chunker.
 """
 
+import logging
 import pytest
 import tempfile
+import wave
 from pathlib import Path
 
 from dataset_pipeline.chunker import AudioChunker
@@ -24,5 +26,69 @@ class TestAudioChunker:
         assert chunker.min_duration_ms == 500
         assert chunker.config.output_subdir == "chunked"
 
-    # Note: Full integration tests would require actual audio and SRT files
-    # For production, you would add more comprehensive tests with mock data
+    def test_process_file_slices_pcm(self, chunker):
+        """Test chunk boundaries, overlap truncation and skipping on a synthetic WAV."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            audio_path = tmppath / "book.wav"
+            srt_path = tmppath / "book.srt"
+
+            # 3 seconds of 16-bit mono at 1 kHz: frame n holds the value n
+            frames = b"".join(n.to_bytes(2, "little") for n in range(3000))
+            with wave.open(str(audio_path), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(1000)
+                wf.writeframes(frames)
+
+            srt_path.write_text(
+                "1\n00:00:00,000 --> 00:00:01,500\nfirst line\n\n"
+                "2\n00:00:01,000 --> 00:00:02,000\nsecond\nline\n\n"
+                "3\n00:00:02,000 --> 00:00:02,200\ntoo short\n\n",
+                encoding="utf-8",
+            )
+
+            chunks, total, skipped, errors = chunker.process_file(
+                str(audio_path), str(srt_path), tmpdir
+            )
+
+            assert total == 3
+            assert skipped == 1
+            assert errors == 0
+            assert chunks == [
+                ("book_segment_0000.wav", "first line"),
+                ("book_segment_0001.wav", "second line"),
+            ]
+
+            # First segment is truncated to where the second one starts
+            with wave.open(str(tmppath / "book_segment_0000.wav"), "rb") as wf:
+                assert wf.getframerate() == 1000
+                assert wf.readframes(wf.getnframes()) == frames[:2000]
+            with wave.open(str(tmppath / "book_segment_0001.wav"), "rb") as wf:
+                assert wf.readframes(wf.getnframes()) == frames[2000:4000]
+
+    def test_run_logs_from_worker_processes(self, caplog):
+        """Test records logged in chunking processes reach the parent's handlers."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            pairs = []
+            for name in ("a", "b"):
+                with wave.open(str(tmppath / f"{name}.wav"), "wb") as wf:
+                    wf.setnchannels(1)
+                    wf.setsampwidth(2)
+                    wf.setframerate(1000)
+                    wf.writeframes(bytes(2000))
+                (tmppath / f"{name}.srt").write_text(
+                    "1\n00:00:00,000 --> 00:00:01,000\nline\n", encoding="utf-8"
+                )
+                pairs.append((str(tmppath / f"{name}.wav"), str(tmppath / f"{name}.srt")))
+            pairs.append((str(tmppath / "missing.wav"), str(tmppath / "a.srt")))
+
+            chunker = AudioChunker(ChunkingConfig(max_workers=2))
+            with caplog.at_level(logging.INFO):
+                chunker.run(pairs, tmpdir)
+
+            assert "Chunking: a.wav" in caplog.text
+            assert "Chunking: b.wav" in caplog.text
+            assert "Error chunking missing.wav" in caplog.text
+            assert chunker.errors == 1
@@ -0,0 +1,37 @@
+"""
+Tests for command-line parsing.
+"""
+
+import pytest
+
+from dataset_pipeline.cli import _build_parser, _fast_parse
+
+
+class TestCli:
+    """Tests for the CLI argument parsers."""
+
+    @pytest.mark.parametrize("argv", [
+        [],
+        ["--skip-validation"],
+        ["-c", "my.yaml", "--skip-merging", "--no-cache"],
+        ["--config=my.yaml", "-i", "in", "--output", "out", "--log-level", "DEBUG"],
+        ["--input", "a", "--input=b", "--skip-chunking", "--log-level=ERROR"],
+    ])
+    def test_fast_parse_matches_argparse(self, argv):
+        """Test the fast path gives the same arguments as argparse."""
+        assert _fast_parse(argv) == _build_parser().parse_args(argv)
+
+    @pytest.mark.parametrize("argv", [
+        ["--help"],
+        ["--version"],
+        ["--conf", "my.yaml"],
+        ["-cmy.yaml"],
+        ["--log-level", "LOUD"],
+        ["--input"],
+        ["--input", "--skip-merging"],
+        ["--skip-merging=yes"],
+        ["extra"],
+    ])
+    def test_fast_parse_defers_to_argparse(self, argv):
+        """Test anything unusual falls back to the full parser."""
+        assert _fast_parse(argv) is None
@@ -2,12 +2,16 @@
 Tests for configuration module.
 """
 
+import logging
 import pytest
 import tempfile
 from pathlib import Path
 import yaml
 
-from dataset_pipeline.config import Config, ChunkingConfig, ValidationConfig
+from dataset_pipeline import config as config_module
+from dataset_pipeline.config import (
+    Config, ChunkingConfig, LoggingConfig, MergingConfig, ValidationConfig, setup_logging
+)
 
 
 class TestConfig:
@@ -25,6 +29,7 @@ class TestConfig:
         assert config.output_dir == "data/output"
         assert config.steps.chunking is True
         assert config.steps.merging is False
+        assert config.use_cache is False
 
     def test_config_from_yaml(self):
         """Test loading config from YAML file."""
@@ -57,6 +62,24 @@ class TestConfig:
             assert config.validation.primary_port == 9000
         finally:
             Path(temp_path).unlink()
+            Path(temp_path).with_name(f".{Path(temp_path).name}.cache.json").unlink(missing_ok=True)
+
+    def test_config_from_yaml_cache(self, monkeypatch):
+        """Test the parsed-YAML cache is reused, invalidated on change, and env still applies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text("input_dir: a\nvalidation:\n  max_workers: 2\n")
+
+            assert Config.from_yaml(str(config_path)).input_dir == "a"
+            assert (Path(tmpdir) / ".config.yaml.cache.json").exists()
+
+            monkeypatch.setenv("DATASET_MAX_WORKERS", "6")
+            config = Config.from_yaml(str(config_path))
+            assert config.input_dir == "a"
+            assert config.validation.max_workers == 6
+
+            config_path.write_text("input_dir: bb\n")
+            assert Config.from_yaml(str(config_path)).input_dir == "bb"
 
     def test_chunking_config_defaults(self):
         """Test ChunkingConfig default values."""
@@ -65,6 +88,16 @@ class TestConfig:
         assert config.min_duration_ms == 500
         assert config.output_subdir == "chunked"
         assert config.metadata_file == "metadata_chunked.csv"
+        assert config.write_workers == 4
+        assert config.max_workers == 4
+
+    def test_merging_config_defaults(self):
+        """Test MergingConfig default values."""
+        config = MergingConfig()
+
+        assert config.keep_first_segment is True
+        assert config.output_subdir == "merged"
+        assert config.max_workers == 4
 
     def test_validation_config_defaults(self):
         """Test ValidationConfig default values."""
@@ -74,3 +107,23 @@ class TestConfig:
         assert config.secondary_port == 8001
         assert config.max_workers == 8
         assert config.language == "fa"
+
+    def test_setup_logging_can_be_repeated(self):
+        """Test reconfiguring logging and stopping the listener more than once."""
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                logging_config = LoggingConfig(console=False, file="test.log")
+                setup_logging(logging_config, log_dir=tmpdir)
+                setup_logging(logging_config, log_dir=tmpdir)
+                logging.getLogger("dataset_pipeline.test").info("hello")
+
+                config_module._stop_log_listener()
+                config_module._stop_log_listener()
+
+                assert config_module._log_listener is None
+                assert "hello" in (Path(tmpdir) / "test.log").read_text(encoding="utf-8")
+        finally:
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
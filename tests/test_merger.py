@@ -0,0 +1,101 @@
+"""
+Tests for audio merger.
+"""
+
+import csv
+import tempfile
+import wave
+from pathlib import Path
+
+from dataset_pipeline.merger import AudioMerger
+from dataset_pipeline.config import MergingConfig
+
+
+def _write_wav(path: Path, frames: bytes, framerate: int = 16000) -> None:
+    """Write 16-bit mono PCM frames to a WAV file."""
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(framerate)
+        wf.writeframes(frames)
+
+
+def _read_frames(path: Path) -> bytes:
+    """Read all PCM frames from a WAV file."""
+    with wave.open(str(path), "rb") as wf:
+        return wf.readframes(wf.getnframes())
+
+
+class TestAudioMerger:
+    """Tests for AudioMerger class."""
+
+    def test_run_merges_pairs(self):
+        """Test first segment is kept and the rest are merged in pairs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            input_dir = tmppath / "chunked"
+            input_dir.mkdir()
+
+            rows = []
+            for i, word in enumerate(["zero", "one", "two", "three"]):
+                _write_wav(input_dir / f"seg_{i}.wav", bytes([i + 1, 0]) * 100)
+                rows.append([f"seg_{i}.wav", word])
+
+            metadata = input_dir / "metadata.csv"
+            with open(metadata, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f, delimiter="|")
+                writer.writerow(["file_name", "text"])
+                writer.writerows(rows)
+
+            merger = AudioMerger(MergingConfig(keep_first_segment=True))
+            output_dir, metadata_path = merger.run(str(input_dir), str(metadata), tmpdir)
+
+            with open(metadata_path, newline="", encoding="utf-8") as f:
+                merged_rows = list(csv.reader(f, delimiter="|"))
+
+            assert merged_rows == [
+                ["file_name", "text"],
+                ["merged_0000.wav", "zero"],
+                ["merged_0001.wav", "one two"],
+                ["merged_0002.wav", "three"],
+            ]
+
+            out = Path(output_dir)
+            assert _read_frames(out / "merged_0000.wav") == bytes([1, 0]) * 100
+            assert _read_frames(out / "merged_0001.wav") == (
+                bytes([2, 0]) * 100 + bytes([3, 0]) * 100
+            )
+            assert _read_frames(out / "merged_0002.wav") == bytes([4, 0]) * 100
+
+    def test_run_discards_first_segment(self):
+        """Test rows after a discarded first segment are paired without a leftover."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            input_dir = tmppath / "chunked"
+            input_dir.mkdir()
+
+            rows = []
+            for i, word in enumerate(["zero", "one", "two", "three", "four"]):
+                _write_wav(input_dir / f"seg_{i}.wav", bytes([i + 1, 0]) * 10)
+                rows.append([f"seg_{i}.wav", word])
+
+            metadata = input_dir / "metadata.csv"
+            with open(metadata, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f, delimiter="|")
+                writer.writerow(["file_name", "text"])
+                writer.writerows(rows)
+
+            merger = AudioMerger(MergingConfig(keep_first_segment=False))
+            output_dir, metadata_path = merger.run(str(input_dir), str(metadata), tmpdir)
+
+            with open(metadata_path, newline="", encoding="utf-8") as f:
+                merged_rows = list(csv.reader(f, delimiter="|"))
+
+            assert merged_rows == [
+                ["file_name", "text"],
+                ["merged_0000.wav", "one two"],
+                ["merged_0001.wav", "three four"],
+            ]
+            assert _read_frames(Path(output_dir) / "merged_0001.wav") == (
+                bytes([4, 0]) * 10 + bytes([5, 0]) * 10
+            )
@@ -0,0 +1,68 @@
+"""
+Tests for pipeline orchestrator.
+"""
+
+import tempfile
+from pathlib import Path
+
+from dataset_pipeline.pipeline import DatasetPipeline
+from dataset_pipeline.config import Config, StepsConfig, MergingConfig
+
+
+class TestDatasetPipeline:
+    """Tests for DatasetPipeline class."""
+
+    def test_run_stage_reuses_cached_outputs(self):
+        """Test a stage is skipped while its inputs and settings are unchanged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            source = tmppath / "metadata.csv"
+            source.write_text("file_name|text\r\n")
+            output = tmppath / "out.csv"
+
+            config = Config(
+                input_dir=tmpdir,
+                output_dir=str(tmppath / "output"),
+                steps=StepsConfig(chunking=False, merging=False, validation=False),
+                use_cache=True
+            )
+            pipeline = DatasetPipeline(config)
+            assert Path(config.stage_dir(".cache")).is_dir()
+
+            calls = []
+
+            def stage():
+                calls.append(1)
+                output.write_text("done")
+                return str(tmppath), str(output)
+
+            def run(merging_config=MergingConfig(), succeeded=lambda: True):
+                return pipeline._run_stage(
+                    "merging", merging_config, [str(source)], stage, succeeded
+                )
+
+            assert run() == (str(tmppath), str(output))
+            assert run() == (str(tmppath), str(output))
+            assert len(calls) == 1
+
+            # Changed settings, changed input and missing outputs all rerun
+            run(MergingConfig(keep_first_segment=False))
+            assert len(calls) == 2
+
+            source.write_text("file_name|text\r\na.wav|a\r\n")
+            run(MergingConfig(keep_first_segment=False))
+            assert len(calls) == 3
+
+            output.unlink()
+            run(MergingConfig(keep_first_segment=False))
+            assert len(calls) == 4
+
+            config.use_cache = False
+            run(MergingConfig(keep_first_segment=False))
+            assert len(calls) == 5
+
+            # A run reported as failed is not recorded
+            config.use_cache = True
+            run(MergingConfig(keep_first_segment=True), succeeded=lambda: False)
+            run(MergingConfig(keep_first_segment=True))
+            assert len(calls) == 7
@@ -2,11 +2,14 @@
 Tests for utility functions.
 """
 
+import csv
 import pytest
 import tempfile
 from pathlib import Path
 
 from dataset_pipeline.utils import (
+    BatchCsvWriter,
+    find_audio_srt_pairs,
     find_srt_for_audio,
     ensure_dir,
     format_duration,
@@ -58,6 +61,32 @@ class TestUtils:
             found_srt = find_srt_for_audio(audio_file)
             assert found_srt is None
 
+    def test_find_audio_srt_pairs(self):
+        """Test pairing audio files with SRT files in one directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+
+            for name in [
+                "b.wav", "b.srt",          # plain SRT
+                "a.mp3", "a.fa.srt",       # language-coded SRT
+                "c.wav",                   # no SRT
+                ".hidden.wav", ".hidden.srt",
+                "notes.txt",
+            ]:
+                (tmppath / name).touch()
+            (tmppath / "d.wav").mkdir()    # directory, not audio
+            (tmppath / "d.srt").touch()
+
+            pairs = find_audio_srt_pairs(tmpdir)
+
+            assert pairs == [
+                (str(tmppath / "a.mp3"), str(tmppath / "a.fa.srt")),
+                (str(tmppath / "b.wav"), str(tmppath / "b.srt")),
+            ]
+            assert find_audio_srt_pairs(tmpdir, "wav") == [
+                (str(tmppath / "b.wav"), str(tmppath / "b.srt")),
+            ]
+
     def test_ensure_dir(self):
         """Test directory creation."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -80,3 +109,31 @@ class TestUtils:
         assert safe_filename("test:file.wav") == "test_file.wav"
         assert safe_filename("file<>name.wav") == "file__name.wav"
         assert safe_filename(" .test. ") == "test"
+
+    def test_batch_csv_writer_matches_csv_module(self):
+        """Test BatchCsvWriter output is byte-identical to csv.writer."""
+        rows = [
+            ("a.wav", "plain text"),
+            ("b.wav", "pipe | inside"),
+            ("c.wav", 'quote " inside'),
+            ("d.wav", "line\nbreak"),
+            ("e.wav", ""),
+            ("f.wav", 42),
+            ("g.wav", "carriage\rreturn"),
+            ("h.wav", None),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            expected_path = Path(tmpdir) / "expected.csv"
+            actual_path = Path(tmpdir) / "actual.csv"
+
+            with open(expected_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, delimiter='|')
+                writer.writerow(["file_name", "text"])
+                writer.writerows(rows)
+
+            with BatchCsvWriter(str(actual_path), ["file_name", "text"], batch_size=2) as writer:
+                writer.add_many(rows[:-1])
+                writer.add(rows[-1])
+
+            assert writer.count == len(rows)
+            assert actual_path.read_bytes() == expected_path.read_bytes()
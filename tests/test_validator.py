@@ -0,0 +1,181 @@
+"""
+Tests for transcription validator.
+"""
+
+import asyncio
+import types
+import pytest
+
+from dataset_pipeline.validator import TranscriptionValidator
+from dataset_pipeline.config import ValidationConfig
+
+
+class TestTranscriptionValidator:
+    """Tests for TranscriptionValidator class."""
+
+    @pytest.fixture
+    def validator(self):
+        """Create TranscriptionValidator instance."""
+        return TranscriptionValidator(ValidationConfig(boundary_window=2))
+
+    def test_normalize_text(self, validator):
+        """Test punctuation removal and whitespace collapsing."""
+        assert validator.normalize_text("") == ""
+        assert validator.normalize_text("hello,   world!") == "hello world"
+        assert validator.normalize_text("سلام  دنیا!") == "سلام دنیا"
+        assert validator.normalize_text("  plain\tenglish  ") == "plain english"
+        # ASCII digits still go through hazm
+        assert validator.normalize_text("abc 123") == validator.normalizer.normalize("abc 123")
+
+    def test_normalize_text_cache(self):
+        """Test repeated texts are normalized once and the cache can be disabled."""
+        validator = TranscriptionValidator(ValidationConfig(text_cache_size=2))
+        for _ in range(3):
+            validator.normalize_text("سلام دنیا")
+        assert validator._normalize_cached.cache_info().misses == 1
+
+        validator = TranscriptionValidator(ValidationConfig(text_cache_size=0))
+        assert validator.normalize_text("سلام  دنیا") == "سلام دنیا"
+        assert validator._normalize_cached.cache_info().currsize == 0
+
+    def test_get_boundaries(self, validator):
+        """Test first/last word extraction."""
+        assert validator.get_boundaries("a b c d e") == (("a", "b"), ("d", "e"))
+        assert validator.get_boundaries("a b c") == (("a", "b", "c"), ("a", "b", "c"))
+        assert validator.get_boundaries("") == ((), ())
+        assert validator.get_boundaries(" a  b\tc d\n") == (("a", "b", "c", "d"),) * 2
+        assert validator.get_boundaries(" a b  c\td e ") == (("a", "b"), ("d", "e"))
+
+    def test_process_single_row_decisions(self, validator, tmp_path):
+        """Test VALID/FLAG decisions from primary and secondary transcripts."""
+        audio = tmp_path / "a.wav"
+        audio.write_bytes(b"RIFF" + bytes(2048))
+
+        def run(srt, primary, secondary):
+            async def fake_transcribe(client, model_name, audio_path):
+                return primary if client == "primary" else secondary
+
+            validator.client_primary = "primary"
+            validator.client_secondary = "secondary"
+            validator.transcribe = fake_transcribe
+            return asyncio.run(validator.process_single_row(["a.wav", srt], str(audio)))
+
+        # Primary agrees with SRT: original text kept
+        assert run("one two three four five", "one two three four five", None) == (
+            "VALID", ["a.wav", "one two three four five"]
+        )
+        # Primary disagrees, secondary backs the primary: primary text kept
+        assert run("one two three four five", "one two three four six",
+                   "one two x four six") == ("VALID", ["a.wav", "one two three four six"])
+        # Models disagree with each other
+        status, data = run("one two three four five", "one two three four six",
+                           "one two three four seven")
+        assert status == "FLAG"
+        assert data[-1] == "Model Disagreement"
+        # Primary failure
+        status, data = run("one two", None, None)
+        assert status == "FLAG"
+        assert data[-1] == "Primary Model Failed"
+
+        # Audio below min_audio_bytes: flagged without transcribing
+        validator.min_audio_bytes = 4096
+        assert run("one two", "one two", None) == (
+            "FLAG", ["a.wav", "one two", "Skipped", "Skipped", "Audio Too Small"]
+        )
+        validator.min_audio_bytes = 1024
+
+        # File deleted after the directory scan: row skipped
+        audio.unlink()
+        assert run("one two", "one two", None) is None
+        audio.write_bytes(b"RIFF" + bytes(2048))
+
+        # Both boundaries miss the SRT: flagged without the secondary when enabled
+        validator.skip_secondary_on_full_mismatch = True
+        assert run("one two three four five", "six seven three eight nine", "unused") == (
+            "FLAG", ["a.wav", "one two three four five", "six seven three eight nine",
+                     "Skipped", "SRT Mismatch"]
+        )
+        assert run("one two three four five", "one two three eight nine",
+                   "x y three eight nine")[0] == "VALID"
+
+    def test_run_writes_valid_and_flagged(self, validator, tmp_path):
+        """Test results are sorted into the validated and flagged CSVs."""
+        (tmp_path / "a.wav").write_bytes(b"RIFF")
+        (tmp_path / "b.wav").write_bytes(b"RIFF")
+        metadata = tmp_path / "metadata.csv"
+        metadata.write_text("file_name|text\na.wav|good\nb.wav|bad\nmissing.wav|gone\n")
+
+        async def fake_process(row, filepath):
+            if row[1] == "good":
+                return ("VALID", row)
+            return ("FLAG", [row[0], row[1], "x", "y", "Model Disagreement"])
+
+        validator.process_single_row = fake_process
+        validated_path, flagged_path = validator.run(str(tmp_path), str(metadata), str(tmp_path))
+
+        with open(validated_path, newline="", encoding="utf-8") as f:
+            assert f.read() == "file_name|text\r\na.wav|good\r\n"
+        with open(flagged_path, newline="", encoding="utf-8") as f:
+            assert f.read() == (
+                "file_name|srt|primary_v3|secondary_turbo|reason\r\n"
+                "b.wav|bad|x|y|Model Disagreement\r\n"
+            )
+
+    def test_run_sort_by_size(self, validator, tmp_path):
+        """Test rows are sent longest file first when sort_by_size is set."""
+        for name, size in [("a.wav", 10), ("b.wav", 30), ("c.wav", 20)]:
+            (tmp_path / name).write_bytes(bytes(size))
+        metadata = tmp_path / "metadata.csv"
+        metadata.write_text("file_name|text\na.wav|a\nb.wav|b\nc.wav|c\n")
+
+        order = []
+
+        async def fake_process(row, filepath):
+            order.append(row[0])
+            return ("VALID", row)
+
+        validator.process_single_row = fake_process
+        validator.sort_by_size = True
+        validator.run(str(tmp_path), str(metadata), str(tmp_path))
+
+        assert order == ["b.wav", "c.wav", "a.wav"]
+
+        # A file removed after the directory scan sorts last instead of failing the run
+        real_iter_tasks = validator._iter_tasks
+
+        def iter_tasks_then_delete(*args):
+            tasks = list(real_iter_tasks(*args))
+            (tmp_path / "b.wav").unlink()
+            return iter(tasks)
+
+        validator._iter_tasks = iter_tasks_then_delete
+        order.clear()
+        validator.run(str(tmp_path), str(metadata), str(tmp_path))
+
+        assert order == ["c.wav", "a.wav", "b.wav"]
+
+    def test_transcribe_respects_server_limit(self, validator):
+        """Test requests to one server never exceed its concurrency limit."""
+        active = []
+        peak = []
+
+        async def create(model, file, language):
+            active.append(file)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(file)
+            return types.SimpleNamespace(text="ok")
+
+        class FakeClient:
+            audio = types.SimpleNamespace(transcriptions=types.SimpleNamespace(create=create))
+
+        client = FakeClient()
+
+        async def main():
+            validator._request_slots = {client: asyncio.Semaphore(2)}
+            return await asyncio.gather(*(
+                validator.transcribe(client, "model", (f"{i}.wav", b"")) for i in range(5)
+            ))
+
+        assert asyncio.run(main()) == ["ok"] * 5
+        assert max(peak) == 2